@@ -0,0 +1,76 @@
+import pymysql
+import os
+from dotenv import load_dotenv
+
+# 환경 변수 로드
+load_dotenv()
+
+UNIQUE_KEY_NAME = 'uq_likes_user_content'
+
+
+# DB 연결 설정
+def get_db_connection():
+    return pymysql.connect(
+        host=os.getenv('MYSQL_HOSTNAME'),
+        user=os.getenv('MYSQL_USERNAME'),
+        password=os.getenv('MYSQL_PASSWORD'),
+        db=os.getenv('MYSQL_DATABASE'),
+        charset='utf8mb4',
+        cursorclass=pymysql.cursors.DictCursor
+    )
+
+
+# likes (userId, contentId) 유니크 키 생성 (좋아요 API의 INSERT IGNORE가 중복을 막으려면 필요)
+def create_likes_unique_key():
+    conn = get_db_connection()
+    try:
+        with conn.cursor() as cursor:
+            # 1. 유니크 키 존재 여부 확인
+            check_index_query = """
+            SELECT COUNT(*) as count
+            FROM information_schema.statistics
+            WHERE table_schema = DATABASE()
+            AND table_name = 'likes'
+            AND index_name = %s
+            """
+            cursor.execute(check_index_query, (UNIQUE_KEY_NAME,))
+            result = cursor.fetchone()
+            if result['count'] > 0:
+                print("유니크 키가 이미 존재합니다.")
+                return
+
+            # 2. 기존 중복 좋아요 정리 (가장 먼저 누른 좋아요 하나만 남김)
+            duplicate_query = """
+            SELECT userId, contentId, COUNT(*) as count
+            FROM likes
+            GROUP BY userId, contentId
+            HAVING COUNT(*) > 1
+            """
+            cursor.execute(duplicate_query)
+            duplicates = cursor.fetchall()
+            for row in duplicates:
+                delete_query = """
+                DELETE FROM likes
+                WHERE userId = %s AND contentId = %s
+                ORDER BY likedAt DESC
+                LIMIT %s
+                """
+                cursor.execute(delete_query, (row['userId'], row['contentId'], row['count'] - 1))
+            print(f"정리된 중복 좋아요 조합 수: {len(duplicates)}")
+
+            # 3. 유니크 키 생성
+            cursor.execute(f"ALTER TABLE likes ADD UNIQUE KEY {UNIQUE_KEY_NAME} (userId, contentId)")
+
+            # 변경사항 저장
+            conn.commit()
+            print("likes 유니크 키가 생성되었습니다.")
+
+    except Exception as e:
+        print(f"에러 발생: {str(e)}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    create_likes_unique_key()
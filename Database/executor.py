@@ -0,0 +1,39 @@
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from Database.pool import DB_POOL_SIZE
+
+# DB 작업 전용 스레드 수 (기본값은 커넥션 풀 크기와 동일 → 스레드가 연결을 기다리며 놀지 않음)
+DB_EXECUTOR_WORKERS = int(os.getenv('DB_EXECUTOR_WORKERS', str(DB_POOL_SIZE)))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=DB_EXECUTOR_WORKERS, thread_name_prefix='db')
+    return _executor
+
+
+async def run_db(func, *args, **kwargs):
+    """
+    블로킹 DB 함수(pymysql, pd.read_sql)를 전용 스레드풀에서 실행하고 결과를 기다린다.
+    쿼리가 도는 동안 이벤트 루프는 다른 요청을 처리할 수 있다.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+
+
+def shutdown_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
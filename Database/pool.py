@@ -0,0 +1,254 @@
+import os
+import threading
+import time
+from collections import deque
+
+import pymysql
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# MySQL 연결 정보
+MYSQL_HOSTNAME = os.getenv('MYSQL_HOSTNAME')
+MYSQL_PORT = int(os.getenv('MYSQL_PORT', '3306'))
+MYSQL_USERNAME = os.getenv('MYSQL_USERNAME')
+MYSQL_PASSWORD = os.getenv('MYSQL_PASSWORD')
+MYSQL_DATABASE = os.getenv('MYSQL_DATABASE')
+
+# 커넥션 풀 설정
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '10'))                           # 워커당 최대 연결 수
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '10'))                   # 대여 대기 최대 시간(초)
+DB_POOL_MAX_LIFETIME = float(os.getenv('DB_POOL_MAX_LIFETIME', '1800'))       # 연결 최대 수명(초)
+DB_POOL_PING_INTERVAL = float(os.getenv('DB_POOL_PING_INTERVAL', '30'))       # 이 시간 이상 쉬었던 연결은 ping 후 대여
+
+
+class PoolTimeoutError(pymysql.err.OperationalError):
+    """풀의 모든 연결이 사용 중이고 대기 시간 안에 반납되지 않은 경우"""
+
+
+class _PoolEntry:
+    __slots__ = ('raw', 'created_at', 'last_used')
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class PooledConnection:
+    """
+    풀에서 대여한 연결. pymysql 연결처럼 사용하면 되고, close() 하면 실제로 끊지 않고 풀에 반납한다.
+    """
+
+    def __init__(self, pool, entry):
+        self._pool = pool
+        self._entry = entry
+
+    @property
+    def open(self):
+        return self._entry is not None and self._entry.raw.open
+
+    def close(self):
+        entry, self._entry = self._entry, None
+        if entry is not None:
+            self._pool._release(entry)
+
+    def __getattr__(self, name):
+        if self._entry is None:
+            raise pymysql.err.InterfaceError(0, "Connection already returned to the pool")
+        return getattr(self._entry.raw, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        # close()를 빠뜨린 경로에서도 연결이 새지 않도록 반납
+        if self.__dict__.get('_entry') is not None:
+            self.close()
+
+
+class ConnectionPool:
+    def __init__(self, max_size=DB_POOL_SIZE, timeout=DB_POOL_TIMEOUT,
+                 max_lifetime=DB_POOL_MAX_LIFETIME, ping_interval=DB_POOL_PING_INTERVAL, **connect_kwargs):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.ping_interval = ping_interval
+        self._connect_kwargs = connect_kwargs
+
+        self._idle = deque()
+        self._size = 0       # 풀이 소유한 연결 수 (idle + 대여 중)
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self._closed = False
+
+        self._created_total = 0
+        self._closed_total = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time_total = 0.0
+        self._timeouts = 0
+        self._failed_pings = 0
+
+    def connection(self, autocommit=False, cursorclass=pymysql.cursors.Cursor):
+        entry = self._acquire()
+        try:
+            entry.raw.autocommit(autocommit)
+            entry.raw.cursorclass = cursorclass
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+            self._discard(entry)
+            raise
+        return PooledConnection(self, entry)
+
+    def _acquire(self):
+        start = time.monotonic()
+        deadline = start + self.timeout
+        waited = False
+
+        while True:
+            entry = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise pymysql.err.InterfaceError(0, "Connection pool is closed")
+                    if self._idle:
+                        entry = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeoutError(0, f"Timed out after {self.timeout}s waiting for a database connection")
+                    waited = True
+                    self._cond.wait(remaining)
+
+            if entry is None:
+                # 빈 자리가 있으므로 새 연결 생성 (락 밖에서 핸드셰이크)
+                try:
+                    entry = _PoolEntry(pymysql.connect(**self._connect_kwargs))
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._created_total += 1
+            elif not self._is_healthy(entry):
+                self._discard(entry)
+                continue
+
+            with self._cond:
+                self._in_use += 1
+                self._checkouts += 1
+                if waited:
+                    self._waits += 1
+                    self._wait_time_total += time.monotonic() - start
+            return entry
+
+    def _is_healthy(self, entry):
+        now = time.monotonic()
+        if not entry.raw.open or now - entry.created_at > self.max_lifetime:
+            return False
+        if now - entry.last_used > self.ping_interval:
+            try:
+                entry.raw.ping(reconnect=False)
+            except Exception:
+                with self._cond:
+                    self._failed_pings += 1
+                return False
+        return True
+
+    def _release(self, entry):
+        raw = entry.raw
+        try:
+            # 커밋/롤백 없이 반납된 트랜잭션은 다음 사용자에게 넘기지 않음
+            # (SELECT만 한 연결은 EOF 패킷으로 끝나 server_status가 갱신되지 않으므로 플래그 대신 항상 롤백)
+            if raw.open and not raw.get_autocommit():
+                raw.rollback()
+        except Exception:
+            raw.close()
+
+        with self._cond:
+            self._in_use -= 1
+        if self._closed or not raw.open or time.monotonic() - entry.created_at > self.max_lifetime:
+            self._discard(entry)
+            return
+
+        entry.last_used = time.monotonic()
+        with self._cond:
+            self._idle.append(entry)
+            self._cond.notify()
+
+    def _discard(self, entry):
+        try:
+            entry.raw.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._size -= 1
+            self._closed_total += 1
+            self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+            self._cond.notify_all()
+        for entry in idle:
+            self._discard(entry)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "created_total": self._created_total,
+                "closed_total": self._closed_total,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "wait_time_total_ms": round(self._wait_time_total * 1000, 3),
+                "timeouts": self._timeouts,
+                "failed_pings": self._failed_pings,
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    host=MYSQL_HOSTNAME,
+                    port=MYSQL_PORT,
+                    user=MYSQL_USERNAME,
+                    password=MYSQL_PASSWORD,
+                    database=MYSQL_DATABASE,
+                    charset='utf8mb4'
+                )
+    return _pool
+
+
+# 데이터베이스 연결 함수 (풀에서 대여, close() 시 반납)
+def get_connection(autocommit=False, cursorclass=pymysql.cursors.Cursor):
+    return get_pool().connection(autocommit=autocommit, cursorclass=cursorclass)
+
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
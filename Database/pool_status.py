@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+from Database.pool import get_pool
+
+router = APIRouter()
+
+
+# 커넥션 풀 상태 확인 엔드포인트
+@router.get("/db/pool")
+async def read_pool_status():
+    return get_pool().stats()
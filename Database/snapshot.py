@@ -0,0 +1,88 @@
+import threading
+import time
+
+
+class RefreshingSnapshot:
+    """
+    loader()가 만든 읽기 전용 데이터를 프로세스 메모리에 들고 있다가 ttl(초)이 지나면 백그라운드에서 다시 읽어 교체한다.
+
+    - 첫 get()만 동기적으로 로드하고, 이후에는 오래된 값이라도 즉시 반환하면서 새로고침은 별도 스레드가 맡는다.
+    - 교체는 참조 하나를 바꾸는 것이므로 읽는 쪽은 항상 완전한 이전 값 또는 완전한 새 값을 본다.
+    - 새로고침이 실패하면 기존 값을 그대로 유지한다.
+    """
+
+    def __init__(self, name, loader, ttl):
+        self.name = name
+        self.ttl = ttl
+        self._loader = loader
+        self._value = None
+        self._version = 0
+        self._loaded_at = 0.0
+        self._load_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+
+    @property
+    def version(self):
+        return self._version
+
+    @property
+    def loaded_at(self):
+        return self._loaded_at
+
+    def get(self):
+        value = self._value
+        if value is None:
+            with self._load_lock:
+                if self._value is None:
+                    self._load()
+                return self._value
+
+        if time.monotonic() - self._loaded_at > self.ttl:
+            self._refresh_in_background()
+        return value
+
+    def get_nowait(self):
+        # get()과 같지만 아직 로드 전이면 기다리지 않고 백그라운드 로드만 시작한 뒤 None을 반환
+        # (이미 연결을 대여한 핸들러가 로더의 연결을 기다리며 풀을 막지 않도록)
+        if self._value is None:
+            self._refresh_in_background()
+            return None
+        return self.get()
+
+    def peek(self):
+        # 로드를 유발하지 않고 현재 값만 확인 (아직 로드 전이면 None)
+        return self._value
+
+    def invalidate(self):
+        # 다음 get()에서 백그라운드 새로고침이 시작되도록 만료 처리
+        self._loaded_at = 0.0
+
+    def refresh(self):
+        with self._load_lock:
+            self._load()
+
+    def _load(self):
+        version = self._version + 1
+        value = self._loader(version)
+        self._value = value
+        self._version = version
+        self._loaded_at = time.monotonic()
+
+    def _refresh_in_background(self):
+        with self._refresh_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Error refreshing {self.name} snapshot: {str(e)}")
+                # 실패해도 계속 재시도하며 DB를 두드리지 않도록 다음 주기까지 기존 값을 유지
+                self._loaded_at = time.monotonic()
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, name=f"{self.name}-refresh", daemon=True).start()
@@ -0,0 +1,66 @@
+"""
+DB 호출 방식별 동시 처리량 비교 벤치마크
+
+- blocking : async 핸들러 안에서 pymysql을 직접 호출 (기존 방식, 이벤트 루프가 멈춤)
+- run_db   : Database.executor.run_db 로 전용 스레드풀에서 실행 (새 방식)
+
+실제 DB 없이 time.sleep 으로 쿼리 지연을 흉내 낸다.
+실행: python -m benchmark.bench_async_db
+"""
+import asyncio
+import time
+
+from Database.executor import DB_EXECUTOR_WORKERS, run_db, shutdown_executor
+
+QUERY_LATENCY = 0.02  # 쿼리 1회당 20ms 가정
+CONCURRENCY_LEVELS = [1, 4, 16, 64, 256]
+
+
+def blocking_query():
+    time.sleep(QUERY_LATENCY)
+    return 1
+
+
+async def handler_blocking():
+    return blocking_query()
+
+
+async def handler_run_db():
+    return await run_db(blocking_query)
+
+
+async def measure(handler, concurrency):
+    # 이벤트 루프가 얼마나 오래 멈추는지 1ms 주기 하트비트로 측정
+    max_lag = 0.0
+    stop = asyncio.Event()
+
+    async def heartbeat():
+        nonlocal max_lag
+        while not stop.is_set():
+            before = time.perf_counter()
+            await asyncio.sleep(0.001)
+            max_lag = max(max_lag, time.perf_counter() - before - 0.001)
+
+    hb = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await asyncio.gather(*(handler() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await hb
+    return elapsed, concurrency / elapsed, max_lag
+
+
+async def main():
+    print(f"query latency {QUERY_LATENCY * 1000:.0f}ms, DB executor workers {DB_EXECUTOR_WORKERS}")
+    print(f"{'mode':<10}{'concurrency':>12}{'wall(ms)':>12}{'req/s':>10}{'max loop lag(ms)':>18}")
+    for name, handler in [('blocking', handler_blocking), ('run_db', handler_run_db)]:
+        await handler()  # 워밍업 (스레드 생성 등)
+        for concurrency in CONCURRENCY_LEVELS:
+            elapsed, rps, lag = await measure(handler, concurrency)
+            print(f"{name:<10}{concurrency:>12}{elapsed * 1000:>12.1f}{rps:>10.1f}{lag * 1000:>18.1f}")
+    shutdown_executor()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
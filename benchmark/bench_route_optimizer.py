@@ -0,0 +1,60 @@
+"""
+코스 경로 최적화 벤치마크
+
+제주 범위 안의 합성 코스(일수 x 하루 지점 수)에 대해 course.route_optimizer의
+최근접 이웃 + 2-opt 재정렬 시간과, 입력 순서 대비 줄어든 이동 거리를 잰다.
+실행: python -m benchmark.bench_route_optimizer
+"""
+import time
+
+import numpy as np
+
+from course.route_optimizer import ROUTE_TIME_BUDGET, distance_matrix, optimize_order, path_length
+
+REPEAT = 20
+# (일수, 하루 지점 수)
+SCENARIOS = [(1, 5), (3, 8), (5, 15), (7, 30), (14, 50)]
+# 숙소처럼 매일 같은 곳에서 출발하는 경우 (제주시청 부근)
+HOTEL = (126.5312, 33.4996)
+
+
+def make_course(days, stops, seed=0):
+    rng = np.random.default_rng(seed)
+    return [(rng.uniform(126.15, 126.95, stops), rng.uniform(33.2, 33.55, stops)) for _ in range(days)]
+
+
+def run(course, start):
+    deadline = time.perf_counter() + ROUTE_TIME_BUDGET
+    optimized = original = 0.0
+    for mapx, mapy in course:
+        _, legs = optimize_order(mapx, mapy, start, deadline)
+        optimized += sum(legs)
+        points_x = ([start[0]] if start else []) + list(mapx)
+        points_y = ([start[1]] if start else []) + list(mapy)
+        original += path_length(distance_matrix(points_x, points_y), np.arange(len(points_x)))
+    return optimized, original
+
+
+def measure(course, start):
+    run(course, start)  # 워밍업
+    times = []
+    for _ in range(REPEAT):
+        begin = time.perf_counter()
+        optimized, original = run(course, start)
+        times.append(time.perf_counter() - begin)
+    return np.median(times), np.max(times), optimized, original
+
+
+def main():
+    print(f"time budget per course: {ROUTE_TIME_BUDGET * 1000:.0f}ms")
+    for start_name, start in (('free start', None), ('hotel start', HOTEL)):
+        print(f"\n[{start_name}]")
+        for days, stops in SCENARIOS:
+            course = make_course(days, stops, seed=days * 100 + stops)
+            median, worst, optimized, original = measure(course, start)
+            print(f"{days:>2} days x {stops:>2} stops: median {median * 1000:7.2f}ms  max {worst * 1000:7.2f}ms  "
+                  f"distance {original:8.1f}km -> {optimized:8.1f}km ({(1 - optimized / original) * 100:5.1f}% shorter)")
+
+
+if __name__ == '__main__':
+    main()
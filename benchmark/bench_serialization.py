@@ -0,0 +1,78 @@
+"""
+응답 직렬화 방식 비교 벤치마크
+
+- to_json   : json.loads(df.to_json(...)) 로 레코드를 만든 뒤 starlette JSONResponse로 다시 직렬화 (기존 방식)
+- orjson    : common.responses.df_to_records + orjson JSONResponse (새 방식, 직렬화 1회)
+
+메인 페이지 섹션 크기(약 50행)와 상세 페이지 크기(1행 + 추천 10행)의 합성 DataFrame을 사용한다.
+실행: python -m benchmark.bench_serialization
+"""
+import datetime
+import json
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+from fastapi.responses import JSONResponse as StarletteJSONResponse
+
+from common.responses import JSONResponse, df_to_records
+
+REPEAT = 300
+
+
+def make_frame(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'contentid': rng.integers(100000, 999999, rows),
+        'title': [f'제주 관광지 {i}' for i in range(rows)],
+        'addr1': ['제주특별자치도 제주시 어딘가로 123'] * rows,
+        'firstimage': [f'http://tong.visitkorea.or.kr/cms/resource/{i}.jpg' for i in range(rows)],
+        'mapx': rng.uniform(126.1, 126.9, rows).round(10),  # 실제 좌표 정밀도 (to_json 기본 double_precision=10)
+        'mapy': rng.uniform(33.2, 33.5, rows).round(10),
+        'cat3': rng.choice(['해수욕장', '카페/전통찻집', '관광호텔'], rows),
+        'like_count': rng.integers(0, 500, rows),
+        'review_count': np.where(rng.random(rows) < 0.2, np.nan, rng.integers(0, 3000, rows)),
+        'eventstartdate': pd.to_datetime('2026-01-01') + pd.to_timedelta(rng.integers(0, 365, rows), unit='D'),
+        # read_sql이 DATE는 datetime.date 객체(object 컬럼), TIME은 timedelta로 돌려주는 경우
+        'modifieddate': [datetime.date(2025, 1, 1) + datetime.timedelta(days=int(day)) if day % 5 else None
+                         for day in rng.integers(0, 365, rows)],
+        'opentime': pd.to_timedelta(rng.integers(0, 86400, rows), unit='s'),
+        'closetime': pd.Series([datetime.timedelta(hours=int(hour)) for hour in rng.integers(0, 24, rows)], dtype=object),
+    })
+
+
+def old_path(frames):
+    content = {name: json.loads(df.to_json(orient='records', force_ascii=False)) for name, df in frames.items()}
+    return StarletteJSONResponse(content=content).body
+
+
+def new_path(frames):
+    content = {name: df_to_records(df) for name, df in frames.items()}
+    return JSONResponse(content=content).body
+
+
+def measure(func, frames):
+    func(frames)  # 워밍업
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        body = func(frames)
+    return (time.perf_counter() - start) / REPEAT, len(body)
+
+
+def main():
+    warnings.filterwarnings('ignore')  # to_json epoch 날짜 형식 경고
+    scenarios = {
+        'main page': {f'view{i}': make_frame(50, seed=i) for i in range(1, 7)},
+        'details': {'result': make_frame(1), 'recommend': make_frame(10, seed=1)},
+    }
+    print(f"{'scenario':<12}{'mode':<10}{'ms/response':>14}{'bytes':>10}")
+    for scenario, frames in scenarios.items():
+        assert json.loads(old_path(frames)) == json.loads(new_path(frames))
+        for name, func in [('to_json', old_path), ('orjson', new_path)]:
+            seconds, size = measure(func, frames)
+            print(f"{scenario:<12}{name:<10}{seconds * 1000:>14.3f}{size:>10}")
+
+
+if __name__ == "__main__":
+    main()
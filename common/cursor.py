@@ -0,0 +1,21 @@
+import base64
+import json
+
+from fastapi import HTTPException
+
+
+def encode_cursor(payload):
+    # 페이지 위치를 클라이언트가 해석하지 않는 불투명 문자열로 변환 (base64url JSON)
+    data = json.dumps(payload, separators=(',', ':'), ensure_ascii=False)
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, *keys):
+    """
+    encode_cursor로 만든 문자열에서 keys 순서대로 값을 꺼내 반환. 형식이 맞지 않으면 400.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        return tuple(payload[key] for key in keys)
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
@@ -0,0 +1,72 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    스레드 안전한 LRU 캐시. maxsize를 넘으면 가장 오래 쓰지 않은 항목부터 버리고,
+    ttl(초)을 주면 그보다 오래된 항목은 없는 것으로 취급한다.
+    """
+
+    def __init__(self, maxsize, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[1] > self.ttl:
+                del self._items[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._items.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def peek(self, key, default=None):
+        # 조회 통계와 LRU 순서를 건드리지 않고 현재 값만 확인 (만료된 항목은 없는 것으로 취급)
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None or (self.ttl is not None and time.monotonic() - entry[1] > self.ttl):
+                return default
+            return entry[0]
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._items[key] = (value, time.monotonic())
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def replace(self, key, value):
+        # 있는 항목의 값만 바꿈 (저장 시각, LRU 순서, 조회 통계는 그대로 → 원래 ttl에 만료). 바꿨으면 True
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None or (self.ttl is not None and time.monotonic() - entry[1] > self.ttl):
+                return False
+            self._items[key] = (value, entry[1])
+            return True
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._items.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self):
+        return {"size": len(self._items), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
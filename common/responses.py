@@ -0,0 +1,108 @@
+import datetime
+import decimal
+import hashlib
+
+import numpy as np
+import orjson
+import pandas as pd
+from fastapi.responses import ORJSONResponse
+
+
+def _default(obj):
+    # orjson이 기본으로 처리하지 못하는 타입 변환
+    if obj is pd.NaT or obj is pd.NA:
+        return None
+    if isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    if isinstance(obj, datetime.timedelta):
+        return _to_epoch_ms(obj)
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class JSONResponse(ORJSONResponse):
+    """
+    orjson 기반 응답 클래스. NaN은 null, numpy 스칼라/배열은 파이썬 값으로 직렬화된다.
+    """
+
+    def render(self, content):
+        return orjson.dumps(content, default=_default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+
+def content_digest(content):
+    # 응답 본문과 같은 방식으로 직렬화한 값의 짧은 해시 (ETag 생성용)
+    body = orjson.dumps(content, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return hashlib.blake2b(body, digest_size=12).hexdigest()
+
+
+def etag_matches(if_none_match, etag):
+    # If-None-Match 헤더(쉼표로 구분된 목록, W/ 약한 비교 허용)에 etag가 있는지 확인
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*':
+            return True
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+_EPOCH_DATE = datetime.date(1970, 1, 1)
+_ONE_MS = pd.Timedelta(milliseconds=1)
+_TEMPORAL_TYPES = (datetime.date, datetime.timedelta)
+
+
+def _to_epoch_ms(value):
+    # date/datetime은 epoch 밀리초, timedelta(TIME 컬럼)는 밀리초 길이로 (to_json과 같은 값)
+    if value is pd.NaT:
+        return None
+    if isinstance(value, datetime.datetime):
+        value = pd.Timestamp(value)
+        if value.tzinfo is not None:
+            value = value.tz_convert('UTC').tz_localize(None)
+        return (value - pd.Timestamp(0)) // _ONE_MS
+    if isinstance(value, datetime.date):
+        return (value - _EPOCH_DATE).days * 86400000
+    return pd.Timedelta(value) // _ONE_MS
+
+
+def _missing_to_none(array):
+    missing = np.isnat(array).tolist()
+    return [None if is_missing else value for value, is_missing in zip(array.astype('int64').tolist(), missing)]
+
+
+def _column_values(values):
+    # 컬럼을 파이썬 값 목록으로 변환. 날짜/시간 값은 기존 to_json 출력과 같은 밀리초 정수로 맞춘다.
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        if getattr(values.dt, 'tz', None) is not None:
+            values = values.dt.tz_convert('UTC').dt.tz_localize(None)
+        return _missing_to_none(values.to_numpy(dtype='datetime64[ms]'))
+    if pd.api.types.is_timedelta64_dtype(values.dtype):
+        return _missing_to_none(values.to_numpy(dtype='timedelta64[ms]'))
+    values = values.tolist()
+    # read_sql은 DATE를 datetime.date, TIME을 timedelta 객체로 object 컬럼에 담아 줌
+    if any(isinstance(value, _TEMPORAL_TYPES) for value in values):
+        return [_to_epoch_ms(value) if isinstance(value, _TEMPORAL_TYPES) else value for value in values]
+    return values
+
+
+def df_to_records(df):
+    """
+    DataFrame을 응답용 레코드 목록으로 변환 (json.loads(df.to_json(...)) 왕복 없이 한 번만 직렬화되도록).
+    NaN은 float 그대로 두고 orjson이 null로 직렬화한다.
+    """
+    columns = []
+    values = []
+    for column, column_values in df.items():
+        columns.append(str(column))
+        values.append(_column_values(column_values))
+    return [dict(zip(columns, row)) for row in zip(*values)]
@@ -1,27 +1,18 @@
 from fastapi import FastAPI, HTTPException, APIRouter, status
 from datetime import datetime
 import pymysql
+from Database.pool import get_connection
+from Database.executor import run_db
+from course.plan_count import apply_plan_counts
 import os
 from pydantic import BaseModel
 from typing import Dict, List, Optional
 
 router = APIRouter()
 
-# MySQL 연결 정보
-MYSQL_HOSTNAME = os.getenv('MYSQL_HOSTNAME')
-MYSQL_PORT = int(os.getenv('MYSQL_PORT'))
-MYSQL_USERNAME = os.getenv('MYSQL_USERNAME')
-MYSQL_PASSWORD = os.getenv('MYSQL_PASSWORD')
-MYSQL_DATABASE = os.getenv('MYSQL_DATABASE')
-
 # 데이터베이스 연결 함수
 def get_db_connection():
-    connection = pymysql.connect(
-        host=MYSQL_HOSTNAME,
-        port=MYSQL_PORT,
-        user=MYSQL_USERNAME,
-        password=MYSQL_PASSWORD,
-        database=MYSQL_DATABASE,
+    connection = get_connection(
         cursorclass=pymysql.cursors.DictCursor,
         autocommit=False  # 트랜잭션 관리 위해 자동 커밋 비활성화
     )
@@ -40,8 +31,7 @@ class CreateCourseResponse(BaseModel):
     courseName: str
     message: str
 
-@router.post("/create", response_model=CreateCourseResponse, status_code=status.HTTP_201_CREATED)
-async def create_course(request: CreateCourseRequest):
+def _create_course(request: CreateCourseRequest):
     connection = get_db_connection()
     try:
         # 0. 요청된 contentId 목록에서 중복 확인
@@ -113,30 +103,8 @@ async def create_course(request: CreateCourseRequest):
             # 데이터 삽입
             cursor.executemany(insert_plan_query, plan_data)
 
-            # 5. 각 content_id에 대해 plan_count 증가
-            allowed_tables = ['visit_main_fix', 'festival_main', 'stay_main',
-                              'culture_main', 'food_main', 'leports_main', 'shopping_main']
-            for content_id in content_ids_set:
-                # 대상 테이블 이름 가져오기
-                cursor.execute("SELECT target_table FROM main_total_v2 WHERE contentsid = %s", (content_id,))
-                result = cursor.fetchone()
-
-                if result and 'target_table' in result:
-                    target_table = result['target_table']
-                else:
-                    raise HTTPException(status_code=400, detail=f"Content ID {content_id} not found in main_total_v2")
-
-                # 허용된 테이블 이름인지 검증
-                if target_table not in allowed_tables:
-                    raise HTTPException(status_code=400, detail=f"Invalid target table for content ID {content_id}")
-
-                # plan_count 필드 증가
-                update_query = f"""
-                UPDATE {target_table}
-                SET plan_count = COALESCE(plan_count, 0) + 1
-                WHERE contentid = %s
-                """
-                cursor.execute(update_query, (content_id,))
+            # 5. 각 content_id에 대해 plan_count 증가 (테이블당 UPDATE 한 번)
+            apply_plan_counts(cursor, connection, added_ids=content_ids_set, strict=True)
 
             # 6. 트랜잭션 커밋
             connection.commit()
@@ -159,4 +127,9 @@ async def create_course(request: CreateCourseRequest):
         raise HTTPException(status_code=500, detail="Internal Server Error")
     finally:
         if connection and connection.open:
-            connection.close()
\ No newline at end of file
+            connection.close()
+
+
+@router.post("/create", response_model=CreateCourseResponse, status_code=status.HTTP_201_CREATED)
+async def create_course(request: CreateCourseRequest):
+    return await run_db(_create_course, request)
\ No newline at end of file
@@ -1,27 +1,18 @@
 from fastapi import FastAPI, HTTPException, APIRouter, status
 from datetime import datetime
 import pymysql
+from Database.pool import get_connection
+from Database.executor import run_db
+from travel.target_table import group_by_table
 import os
 from pydantic import BaseModel
 from typing import Dict, List, Optional
 
 router = APIRouter()
 
-# MySQL 연결 정보
-MYSQL_HOSTNAME = os.getenv('MYSQL_HOSTNAME')
-MYSQL_PORT = int(os.getenv('MYSQL_PORT'))
-MYSQL_USERNAME = os.getenv('MYSQL_USERNAME')
-MYSQL_PASSWORD = os.getenv('MYSQL_PASSWORD')
-MYSQL_DATABASE = os.getenv('MYSQL_DATABASE')
-
 # 데이터베이스 연결 함수
 def get_db_connection():
-    connection = pymysql.connect(
-        host=MYSQL_HOSTNAME,
-        port=MYSQL_PORT,
-        user=MYSQL_USERNAME,
-        password=MYSQL_PASSWORD,
-        database=MYSQL_DATABASE,
+    connection = get_connection(
         cursorclass=pymysql.cursors.DictCursor,
         autocommit=False  # 트랜잭션 관리 위해 자동 커밋 비활성화
     )
@@ -53,8 +44,22 @@ class GetCourseDetailsResponse(BaseModel):
     totalBudget: int
     plans: List[DatePlan]
 
-@router.post("/details", response_model=GetCourseDetailsResponse, status_code=status.HTTP_200_OK)
-async def get_course_details(request: GetCourseDetailsRequest):
+# 코스 콘텐츠 상세 정보를 테이블별로 묶어 테이블당 한 번의 IN 쿼리로 조회
+def fetch_plan_details(cursor, connection, content_ids):
+    details = {}
+    for target_table, ids in group_by_table(content_ids, connection).items():
+        detail_query = f"""
+        SELECT contentid, firstimage, title, cat3, address, mapx, mapy, COALESCE(numprice, 0) as numprice
+        FROM {target_table}
+        WHERE contentid IN %s
+        """
+        cursor.execute(detail_query, (tuple(ids),))
+        for detail in cursor.fetchall():
+            details.setdefault(detail['contentid'], detail)
+    return details
+
+
+def _get_course_details(request: GetCourseDetailsRequest):
     connection = get_db_connection()
     try:
         with connection.cursor() as cursor:
@@ -72,7 +77,7 @@ async def get_course_details(request: GetCourseDetailsRequest):
             if not course_name:
                 raise HTTPException(status_code=500, detail="Course name not found.")
 
-            # 2. 여행 일수 및 관광 아이템 수 계산
+            # 2. 코스 일정 전체 조회
             get_plans_query = """
             SELECT planning_date, contentId, sequence
             FROM course_plans
@@ -84,22 +89,29 @@ async def get_course_details(request: GetCourseDetailsRequest):
             if not plans:
                 raise HTTPException(status_code=404, detail="No plans found for this course.")
 
+            # 3. 날짜별로 한 번에 묶기 (쿼리가 날짜 순이므로 등장 순서가 곧 날짜 순)
+            date_buckets = {}
+            for plan in plans:
+                date_buckets.setdefault(plan['planning_date'], []).append(plan)
+            unique_dates = sorted(date_buckets)
+
             # 여행 일수 계산 (고유한 planning_date의 수)
-            unique_dates = sorted(set(plan['planning_date'] for plan in plans))
             total_days = len(unique_dates)
 
             # 관광 아이템 수 계산 (고유한 contentId의 수)
             unique_content_ids = set(plan['contentId'] for plan in plans if plan['contentId'])
             total_items = len(unique_content_ids)
 
+            # 4. 콘텐츠 상세 정보를 테이블별로 한 번의 IN 쿼리로 조회 (허용되지 않은/없는 콘텐츠는 제외됨)
+            details = fetch_plan_details(cursor, connection, unique_content_ids)
+
             # 총 예산 계산을 위한 변수
             total_budget = 0
 
-            # 3. 날짜별 콘텐츠 리스트 구성
+            # 5. 날짜별 콘텐츠 리스트 구성
             date_plans = []
             for date in unique_dates:
-                # 해당 날짜의 콘텐츠 가져오기
-                date_contents = [plan for plan in plans if plan['planning_date'] == date]
+                date_contents = date_buckets[date]
                 # sequence가 없으면 순서대로, 있으면 sequence 순으로 정렬
                 date_contents.sort(key=lambda x: x['sequence'] if x['sequence'] is not None else 0)
 
@@ -110,28 +122,7 @@ async def get_course_details(request: GetCourseDetailsRequest):
                     if content_id is None:
                         continue  # contentId가 없는 경우 건너뜀
 
-                    # 4. 콘텐츠 상세 정보 조회
-                    # main_total_v2에서 target_table 가져오기
-                    cursor.execute("SELECT target_table FROM main_total_v2 WHERE contentsid = %s", (content_id,))
-                    target_result = cursor.fetchone()
-                    if not target_result or 'target_table' not in target_result:
-                        continue  # target_table이 없으면 건너뜀
-
-                    target_table = target_result['target_table']
-                    # 허용된 테이블 목록
-                    allowed_tables = ['visit_main_fix', 'festival_main', 'stay_main',
-                                      'culture_main', 'food_main', 'leports_main', 'shopping_main']
-                    if target_table not in allowed_tables:
-                        continue  # 허용되지 않은 테이블이면 건너뜀
-
-                    # 상세 정보 조회
-                    detail_query = f"""
-                    SELECT contentid, firstimage, title, cat3, address, mapx, mapy, COALESCE(numprice, 0) as numprice
-                    FROM {target_table}
-                    WHERE contentid = %s
-                    """
-                    cursor.execute(detail_query, (content_id,))
-                    detail = cursor.fetchone()
+                    detail = details.get(content_id)
                     if not detail:
                         continue  # 상세 정보가 없으면 건너뜀
 
@@ -169,6 +160,10 @@ async def get_course_details(request: GetCourseDetailsRequest):
             )
             return response
 
+    except HTTPException as he:
+        if connection:
+            connection.rollback()
+        raise he
     except pymysql.MySQLError as err:
         if connection:
             connection.rollback()
@@ -181,4 +176,9 @@ async def get_course_details(request: GetCourseDetailsRequest):
         raise HTTPException(status_code=500, detail="Internal Server Error")
     finally:
         if connection and connection.open:
-            connection.close()
\ No newline at end of file
+            connection.close()
+
+
+@router.post("/details", response_model=GetCourseDetailsResponse, status_code=status.HTTP_200_OK)
+async def get_course_details(request: GetCourseDetailsRequest):
+    return await run_db(_get_course_details, request)
\ No newline at end of file
@@ -3,6 +3,9 @@ from typing import List
 from fastapi import FastAPI, HTTPException, APIRouter, status, Query
 from datetime import datetime, timedelta
 import pymysql
+from Database.pool import get_connection
+from Database.executor import run_db
+from course.plan_count import apply_plan_counts
 import os
 from typing import List
 
@@ -11,21 +14,9 @@ class AddToCourseRequest(BaseModel):
     courseId: int
     contentIds: List[int]
 
-# MySQL 연결 정보 (기존과 동일)
-MYSQL_HOSTNAME = os.getenv('MYSQL_HOSTNAME')
-MYSQL_PORT = int(os.getenv('MYSQL_PORT'))
-MYSQL_USERNAME = os.getenv('MYSQL_USERNAME')
-MYSQL_PASSWORD = os.getenv('MYSQL_PASSWORD')
-MYSQL_DATABASE = os.getenv('MYSQL_DATABASE')
-
 # 데이터베이스 연결 함수 (기존과 동일)
 def get_db_connection():
-    connection = pymysql.connect(
-        host=MYSQL_HOSTNAME,
-        port=MYSQL_PORT,
-        user=MYSQL_USERNAME,
-        password=MYSQL_PASSWORD,
-        database=MYSQL_DATABASE,
+    connection = get_connection(
         cursorclass=pymysql.cursors.DictCursor,
         autocommit=False
     )
@@ -34,8 +25,43 @@ def get_db_connection():
 router = APIRouter()
 
 
-@router.post("/add_to_course", status_code=status.HTTP_200_OK)
-async def add_to_course(request: AddToCourseRequest):
+def plan_slots(plan_rows, content_ids, today):
+    """
+    코스 일정(planning_date, sequence 순) 위에 contentIds를 배치해
+    ([(빈 슬롯 planId, contentId)], [(날짜, contentId, sequence)])를 반환.
+
+    - 날짜 순으로 빈 슬롯(contentId가 NULL인 행)을 먼저 채운다
+    - 남은 contentId는 첫 번째 날짜 끝에 이어 붙인다 (sequence는 그날 최대값 + 1부터)
+    - 코스에 날짜가 하나도 없으면 오늘부터 하루에 하나씩 새 날짜를 만든다
+    """
+    # 날짜가 없는 행은 어느 날짜에도 속하지 않으므로 배치 대상에서 제외
+    plan_rows = [row for row in plan_rows if row['planning_date'] is not None]
+    content_ids_iter = iter(content_ids)
+    slot_updates = []
+    for row in plan_rows:
+        if row['contentId'] is not None:
+            continue
+        content_id = next(content_ids_iter, None)
+        if content_id is None:
+            break
+        slot_updates.append((row['planId'], content_id))
+
+    new_plans = []
+    if plan_rows:
+        first_date = plan_rows[0]['planning_date']
+        sequences = [row['sequence'] for row in plan_rows
+                     if row['planning_date'] == first_date and row['sequence'] is not None]
+        next_sequence = max(sequences, default=0) + 1
+        for content_id in content_ids_iter:
+            new_plans.append((first_date, content_id, next_sequence))
+            next_sequence += 1
+    else:
+        for days, content_id in enumerate(content_ids_iter):
+            new_plans.append((today + timedelta(days=days), content_id, 1))
+    return slot_updates, new_plans
+
+
+def _add_to_course(request: AddToCourseRequest):
     connection = get_db_connection()
     try:
         with connection.cursor() as cursor:
@@ -51,149 +77,52 @@ async def add_to_course(request: AddToCourseRequest):
             # 코스 이름 가져오기
             course_title = course['courseName']
 
-            # 1-1. 중복된 contentId가 있는지 확인
-            existing_content_query = """
-                        SELECT contentId FROM course_plans
-                        WHERE courseId = %s AND contentId IS NOT NULL
-                        """
-            cursor.execute(existing_content_query, (request.courseId,))
-            existing_contents = cursor.fetchall()
-            existing_content_ids = set([row['contentId'] for row in existing_contents])
+            # 1-1. 코스 일정 전체를 한 번에 읽기 (날짜, sequence 순)
+            get_plan_query = """
+            SELECT planId, planning_date, contentId, sequence
+            FROM course_plans
+            WHERE courseId = %s
+            ORDER BY planning_date ASC, sequence ASC, planId ASC
+            """
+            cursor.execute(get_plan_query, (request.courseId,))
+            plan_rows = cursor.fetchall()
 
             # 요청된 contentIds와 기존 contentIds의 교집합 찾기
+            existing_content_ids = set([row['contentId'] for row in plan_rows if row['contentId'] is not None])
             duplicate_content_ids = existing_content_ids.intersection(set(request.contentIds))
             if duplicate_content_ids:
                 # 중복된 경우 메시지에 '중복'이라고 반환
                 return {"message": "중복"}
 
-            # 2. 해당 코스의 날짜 목록 가져오기 (planning_date 기준으로 오름차순)
-            get_course_dates_query = """
-            SELECT DISTINCT planning_date
-            FROM course_plans
-            WHERE courseId = %s
-            ORDER BY planning_date ASC
-            """
-            cursor.execute(get_course_dates_query, (request.courseId,))
-            course_dates = [row['planning_date'] for row in cursor.fetchall()]
-
-            # 3. 각 날짜별로 빈 슬롯과 총 슬롯 수를 가져오기
-            date_slots = {}
-            for date in course_dates:
-                get_slots_query = """
-                SELECT planId, contentId
-                FROM course_plans
-                WHERE courseId = %s AND planning_date = %s
-                ORDER BY sequence ASC
+            # 2~6. 빈 슬롯 채우기 / 추가 위치를 메모리에서 계산
+            slot_updates, new_plans = plan_slots(plan_rows, request.contentIds, datetime.today().date())
+
+            # 빈 슬롯은 한 번의 UPDATE로 채우기
+            if slot_updates:
+                cases = ' '.join(['WHEN %s THEN %s'] * len(slot_updates))
+                update_slot_query = f"""
+                UPDATE course_plans
+                SET contentId = CASE planId {cases} END
+                WHERE planId IN %s
                 """
-                cursor.execute(get_slots_query, (request.courseId, date))
-                slots = cursor.fetchall()
-                empty_slots = [slot for slot in slots if slot['contentId'] is None]
-                date_slots[date] = {
-                    'empty_slots': empty_slots,
-                    'total_slots': slots,
-                }
-
-            # 4. 추가할 contentIds를 날짜별로 할당
-            content_ids_iter = iter(request.contentIds)
-            content_ids_set = set()
-            for date in course_dates:
-                slots_info = date_slots[date]
-                empty_slots = slots_info['empty_slots']
-
-                # 빈 슬롯에 채우기
-                for slot in empty_slots:
-                    try:
-                        content_id = next(content_ids_iter)
-                        update_slot_query = """
-                        UPDATE course_plans
-                        SET contentId = %s
-                        WHERE planId = %s
-                        """
-                        cursor.execute(update_slot_query, (content_id, slot['planId']))
-                        content_ids_set.add(content_id)
-                    except StopIteration:
-                        break  # contentIds를 모두 사용한 경우 루프 종료
-
-            # 5. 남은 contentIds를 날짜별로 삽입
-            for date in course_dates:
-                while True:
-                    try:
-                        content_id = next(content_ids_iter)
-                        # 해당 날짜에 새로운 sequence 계산
-                        get_max_sequence_query = """
-                        SELECT MAX(sequence) as max_sequence
-                        FROM course_plans
-                        WHERE courseId = %s AND planning_date = %s
-                        """
-                        cursor.execute(get_max_sequence_query, (request.courseId, date))
-                        max_seq_result = cursor.fetchone()
-                        next_sequence = (max_seq_result['max_sequence'] or 0) + 1
-
-                        # 새로운 레코드 삽입
-                        insert_plan_query = """
-                        INSERT INTO course_plans (courseId, planning_date, contentId, sequence)
-                        VALUES (%s, %s, %s, %s)
-                        """
-                        cursor.execute(insert_plan_query, (
-                            request.courseId,
-                            date,
-                            content_id,
-                            next_sequence
-                        ))
-                        content_ids_set.add(content_id)
-                    except StopIteration:
-                        break  # contentIds를 모두 사용한 경우 루프 종료
-
-            # 6. 아직 남은 contentIds가 있다면, 마지막 날짜에 새로운 날짜를 추가하여 삽입
-            while True:
-                try:
-                    content_id = next(content_ids_iter)
-                    # 마지막 날짜의 다음 날짜 계산
-                    if course_dates:
-                        last_date = course_dates[-1] + timedelta(days=1)
-                    else:
-                        last_date = datetime.today().date()
-
-                    # 새로운 레코드 삽입
-                    insert_plan_query = """
-                    INSERT INTO course_plans (courseId, planning_date, contentId, sequence)
-                    VALUES (%s, %s, %s, %s)
-                    """
-                    cursor.execute(insert_plan_query, (
-                        request.courseId,
-                        last_date,
-                        content_id,
-                        1  # sequence 시작값
-                    ))
-                    content_ids_set.add(content_id)
-                    course_dates.append(last_date)  # 새로운 날짜 추가
-                except StopIteration:
-                    break  # contentIds를 모두 사용한 경우 루프 종료
-
-            # 7. 각 contentId에 대해 plan_count 증가
-            allowed_tables = ['visit_main_fix', 'festival_main', 'stay_main',
-                              'culture_main', 'food_main', 'leports_main', 'shopping_main']
-            for content_id in content_ids_set:
-                # 대상 테이블 이름 가져오기
-                cursor.execute("SELECT target_table FROM main_total_v2 WHERE contentsid = %s", (content_id,))
-                target_result = cursor.fetchone()
-
-                if target_result and 'target_table' in target_result:
-                    target_table = target_result['target_table']
-                else:
-                    raise HTTPException(status_code=400, detail=f"Content ID {content_id} not found in main_total_v2")
-
-                # 허용된 테이블인지 확인
-                if target_table not in allowed_tables:
-                    raise HTTPException(status_code=400, detail=f"Invalid target table for content ID {content_id}")
-
-                # plan_count 증가
-                update_query = f"""
-                UPDATE {target_table}
-                SET plan_count = COALESCE(plan_count, 0) + 1
-                WHERE contentid = %s
+                params = [value for plan_id, content_id in slot_updates for value in (plan_id, content_id)]
+                params.append(tuple(plan_id for plan_id, _ in slot_updates))
+                cursor.execute(update_slot_query, params)
+
+            # 새 일정은 한 번에 삽입
+            if new_plans:
+                insert_plan_query = """
+                INSERT INTO course_plans (courseId, planning_date, contentId, sequence)
+                VALUES (%s, %s, %s, %s)
                 """
-                cursor.execute(update_query, (content_id,))
+                cursor.executemany(insert_plan_query, [
+                    (request.courseId, plan_date, content_id, sequence)
+                    for plan_date, content_id, sequence in new_plans
+                ])
+            content_ids_set = set(request.contentIds)
+
+            # 7. 각 contentId에 대해 plan_count 증가 (테이블당 UPDATE 한 번)
+            apply_plan_counts(cursor, connection, added_ids=content_ids_set, strict=True)
 
             # 8. 트랜잭션 커밋
             connection.commit()
@@ -212,4 +141,9 @@ async def add_to_course(request: AddToCourseRequest):
         raise HTTPException(status_code=500, detail="Internal Server Error")
     finally:
         if connection and connection.open:
-            connection.close()
\ No newline at end of file
+            connection.close()
+
+
+@router.post("/add_to_course", status_code=status.HTTP_200_OK)
+async def add_to_course(request: AddToCourseRequest):
+    return await run_db(_add_to_course, request)
\ No newline at end of file
@@ -0,0 +1,61 @@
+from fastapi import HTTPException
+
+from travel.target_table import ALLOWED_TABLES, resolve_target_tables
+
+# 일정 추가/제거에 따른 plan_count 변경 쿼리 (감소는 0 아래로 내려가지 않게)
+PLAN_COUNT_INCREMENT = "COALESCE(plan_count, 0) + 1"
+PLAN_COUNT_DECREMENT = "GREATEST(COALESCE(plan_count, 1) - 1, 0)"
+
+
+def group_plan_count_targets(content_ids, connection, strict=False):
+    """
+    contentid를 허용된 테이블별로 묶어 {table: [contentid, ...]}로 반환 (contentid는 정렬해서 잠금 순서를 고정).
+    strict이면 main_total_v2에 없거나 허용되지 않은 테이블의 contentid에서 400을 내고, 아니면 건너뛴다.
+    """
+    content_ids = sorted({int(content_id) for content_id in content_ids if content_id is not None})
+    if not content_ids:
+        return {}
+
+    target_tables = resolve_target_tables(content_ids, connection)
+    groups = {}
+    for content_id in content_ids:
+        target_table = target_tables.get(content_id)
+        if target_table is None:
+            if strict:
+                raise HTTPException(status_code=400, detail=f"Content ID {content_id} not found in main_total_v2")
+            continue
+        if target_table not in ALLOWED_TABLES:
+            if strict:
+                raise HTTPException(status_code=400, detail=f"Invalid target table for content ID {content_id}")
+            continue
+        groups.setdefault(target_table, []).append(content_id)
+    return groups
+
+
+def apply_plan_counts(cursor, connection, added_ids=(), removed_ids=(), strict=False):
+    """
+    추가된 contentid는 plan_count +1, 제거된 contentid는 -1을 테이블당 변경 방향별 UPDATE 한 번으로 반영.
+    호출한 쪽의 트랜잭션 안에서 실행되며 커밋은 호출한 쪽에서 한다. 실행한 UPDATE 수를 반환.
+    """
+    added_ids = {int(content_id) for content_id in added_ids if content_id is not None}
+    removed_ids = {int(content_id) for content_id in removed_ids if content_id is not None}
+    # 같은 contentid가 양쪽에 있으면 변화 없음
+    added_ids, removed_ids = added_ids - removed_ids, removed_ids - added_ids
+
+    # 테이블 조회는 한 번에 (strict 검증도 UPDATE 전에 끝냄)
+    groups = group_plan_count_targets(added_ids | removed_ids, connection, strict)
+
+    statements = 0
+    for table in sorted(groups):
+        for expression, targets in ((PLAN_COUNT_DECREMENT, removed_ids), (PLAN_COUNT_INCREMENT, added_ids)):
+            content_ids = [content_id for content_id in groups[table] if content_id in targets]
+            if not content_ids:
+                continue
+            update_query = f"""
+            UPDATE {table}
+            SET plan_count = {expression}
+            WHERE contentid IN %s
+            """
+            cursor.execute(update_query, (tuple(content_ids),))
+            statements += 1
+    return statements
@@ -0,0 +1,111 @@
+from collections import defaultdict, deque
+from typing import NamedTuple
+
+
+class PlanDiff(NamedTuple):
+    # 삭제할 planId 목록
+    deletes: list
+    # (planId, planning_date, contentId, sequence) - 값이 바뀐 기존 행
+    updates: list
+    # (planning_date, contentId, sequence) - 새로 넣을 행
+    inserts: list
+
+    def __bool__(self):
+        return bool(self.deletes or self.updates or self.inserts)
+
+
+def load_plan_rows(cursor, course_id):
+    # 코스의 저장된 일정 전체 (날짜, sequence 순)
+    get_plan_query = """
+    SELECT planId, planning_date, contentId, sequence
+    FROM course_plans
+    WHERE courseId = %s
+    ORDER BY planning_date ASC, sequence ASC, planId ASC
+    """
+    cursor.execute(get_plan_query, (course_id,))
+    return cursor.fetchall()
+
+
+def diff_plan(stored_rows, desired_rows):
+    """
+    저장된 일정(planId, planning_date, contentId, sequence 행)과 요청된 일정((planning_date, contentId, sequence))을 비교해
+    필요한 삭제/수정/삽입만 계산한다.
+
+    - 콘텐츠가 있는 행은 contentId로 짝을 지어, 날짜나 sequence가 달라졌을 때만 수정한다
+    - 빈 날짜 자리(contentId가 NULL인 행)는 같은 날짜끼리 짝을 짓는다
+    - 새 콘텐츠는 같은 날짜에 남는 빈 자리가 있으면 그 행을 채운다
+    - 그래도 짝이 없는 저장된 행은 삭제, 짝이 없는 요청 행은 삽입
+    """
+    # 같은 키의 행이 여러 개일 수 있으므로 저장 순서대로 하나씩 짝을 지음
+    by_content = defaultdict(deque)
+    by_empty_date = defaultdict(deque)
+    for row in stored_rows:
+        if row['contentId'] is not None:
+            by_content[row['contentId']].append(row)
+        else:
+            by_empty_date[row['planning_date']].append(row)
+
+    updates = []
+    unmatched = []
+    for plan_date, content_id, sequence in desired_rows:
+        candidates = by_content[content_id] if content_id is not None else by_empty_date[plan_date]
+        if not candidates:
+            unmatched.append((plan_date, content_id, sequence))
+            continue
+        row = candidates.popleft()
+        if row['planning_date'] != plan_date or row['sequence'] != sequence:
+            updates.append((row['planId'], plan_date, content_id, sequence))
+
+    inserts = []
+    for plan_date, content_id, sequence in unmatched:
+        candidates = by_empty_date[plan_date]
+        if content_id is not None and candidates:
+            updates.append((candidates.popleft()['planId'], plan_date, content_id, sequence))
+        else:
+            inserts.append((plan_date, content_id, sequence))
+
+    deletes = sorted(row['planId'] for rows in (by_content, by_empty_date)
+                     for candidates in rows.values() for row in candidates)
+    return PlanDiff(deletes, updates, inserts)
+
+
+def apply_plan_diff(cursor, course_id, diff):
+    """
+    삭제(IN 한 번) → 수정(CASE UPDATE 한 번) → 삽입(executemany 한 번) 순으로 반영하고 실행한 쿼리 수를 반환.
+    호출한 쪽의 트랜잭션 안에서 실행되며 커밋은 호출한 쪽에서 한다.
+    """
+    statements = 0
+    if diff.deletes:
+        delete_plans_query = """
+        DELETE FROM course_plans WHERE courseId = %s AND planId IN %s
+        """
+        cursor.execute(delete_plans_query, (course_id, tuple(diff.deletes)))
+        statements += 1
+
+    if diff.updates:
+        # 세 컬럼을 planId별 CASE로 한 번에 수정
+        cases = ' '.join(['WHEN %s THEN %s'] * len(diff.updates))
+        update_plans_query = f"""
+        UPDATE course_plans
+        SET planning_date = CASE planId {cases} END,
+            contentId = CASE planId {cases} END,
+            sequence = CASE planId {cases} END
+        WHERE courseId = %s AND planId IN %s
+        """
+        params = []
+        for column in (1, 2, 3):
+            params += [value for update in diff.updates for value in (update[0], update[column])]
+        params += [course_id, tuple(update[0] for update in diff.updates)]
+        cursor.execute(update_plans_query, params)
+        statements += 1
+
+    if diff.inserts:
+        insert_plan_query = """
+        INSERT INTO course_plans (courseId, planning_date, contentId, sequence)
+        VALUES (%s, %s, %s, %s)
+        """
+        cursor.executemany(insert_plan_query, [
+            (course_id, plan_date, content_id, sequence) for plan_date, content_id, sequence in diff.inserts
+        ])
+        statements += 1
+    return statements
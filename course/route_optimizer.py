@@ -0,0 +1,247 @@
+from fastapi import HTTPException, APIRouter, status
+import pymysql
+import numpy as np
+import os
+import time
+from pydantic import BaseModel
+from typing import Optional
+from Database.pool import get_connection
+from Database.executor import run_db
+from travel.catalog import lookup_card_fields
+from course.plan_diff import apply_plan_diff, diff_plan, load_plan_rows
+
+router = APIRouter()
+
+EARTH_RADIUS_KM = 6371.0088
+# 코스 하나를 최적화하는 데 쓰는 최대 시간(초). 넘으면 그 시점까지 개선된 순서를 반환
+ROUTE_TIME_BUDGET = float(os.getenv('ROUTE_TIME_BUDGET', '0.2'))
+
+
+def get_db_connection():
+    connection = get_connection(
+        cursorclass=pymysql.cursors.DictCursor,
+        autocommit=False  # 트랜잭션 관리
+    )
+    return connection
+
+# 요청 모델 정의
+class StartPoint(BaseModel):
+    mapx: float  # 경도
+    mapy: float  # 위도
+
+class OptimizeRouteRequest(BaseModel):
+    userId: int
+    courseId: int
+    start: Optional[StartPoint] = None  # 매일 출발하는 고정 지점 (예: 숙소)
+    apply: bool = False  # True면 최적화된 순서를 코스에 저장
+
+
+def distance_matrix(mapx, mapy):
+    # 좌표 배열 사이의 haversine 거리 행렬 (km)
+    lon = np.radians(np.asarray(mapx, dtype=np.float64))
+    lat = np.radians(np.asarray(mapy, dtype=np.float64))
+    dlon = lon[:, None] - lon[None, :]
+    dlat = lat[:, None] - lat[None, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat[:, None]) * np.cos(lat[None, :]) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def path_length(dist, order):
+    order = np.asarray(order)
+    return float(dist[order[:-1], order[1:]].sum()) if len(order) > 1 else 0.0
+
+
+def nearest_neighbour(dist, start=0):
+    # start에서 출발해 가장 가까운 미방문 지점으로 이동하는 순서
+    n = len(dist)
+    visited = np.zeros(n, dtype=bool)
+    order = [start]
+    visited[start] = True
+    for _ in range(n - 1):
+        row = np.where(visited, np.inf, dist[order[-1]])
+        order.append(int(np.argmin(row)))
+        visited[order[-1]] = True
+    return np.asarray(order)
+
+
+def two_opt(dist, order, fixed_start=False, deadline=None):
+    """
+    열린 경로(출발점으로 돌아오지 않음)에 대한 2-opt. 매 반복마다 모든 구간 뒤집기의 이득을 행렬로 계산해
+    가장 큰 개선 하나를 적용한다. fixed_start면 order[0]은 움직이지 않는다.
+
+    양 끝이 자유롭게 바뀔 수 있도록 모든 지점과 거리 0인 가상 지점을 경로 양끝(고정 출발이면 뒤에만)에 붙여서 계산한다.
+    """
+    n = len(order)
+    if n < 3:
+        return np.asarray(order)
+    virtual = n
+    extended = np.zeros((n + 1, n + 1))
+    extended[:n, :n] = dist
+    path = list(order) + [virtual]
+    if not fixed_start:
+        path = [virtual] + path
+    path = np.asarray(path)
+
+    while deadline is None or time.perf_counter() < deadline:
+        # 간선 k = (path[k], path[k + 1]); 간선 s < t를 끊고 path[s+1..t]를 뒤집는 경우의 거리 변화
+        a, b = path[:-1], path[1:]
+        edge = extended[a, b]
+        gain = extended[a[:, None], a[None, :]] + extended[b[:, None], b[None, :]] - edge[:, None] - edge[None, :]
+        gain[np.tril_indices(len(edge))] = 0.0
+        s, t = np.unravel_index(np.argmin(gain), gain.shape)
+        if gain[s, t] >= -1e-9:
+            break
+        path[s + 1:t + 1] = path[s + 1:t + 1][::-1]
+
+    return path[path != virtual]
+
+
+def optimize_order(mapx, mapy, start=None, deadline=None):
+    """
+    한 날짜의 지점들을 이동 거리가 짧아지도록 정렬. start=(mapx, mapy)를 주면 그 지점에서 출발하는 것으로 계산한다.
+    (지점 위치 순서, 구간별 거리 km 목록)을 반환. 구간 거리는 출발 지점 → 첫 지점부터 (start가 없으면 첫 지점은 0).
+    """
+    n = len(mapx)
+    if n == 0:
+        return [], []
+    if start is not None:
+        dist = distance_matrix([start[0], *mapx], [start[1], *mapy])
+        order = two_opt(dist, nearest_neighbour(dist, 0), fixed_start=True, deadline=deadline)
+        legs = dist[order[:-1], order[1:]].tolist()
+        return (order[1:] - 1).tolist(), legs
+
+    dist = distance_matrix(mapx, mapy)
+    order = two_opt(dist, nearest_neighbour(dist, 0), deadline=deadline)
+    legs = [0.0] + dist[order[:-1], order[1:]].tolist()
+    return order.tolist(), legs
+
+
+def get_coordinates(cursor, connection, content_ids):
+    # contentId → (mapx, mapy). 카탈로그 카드에서 먼저 찾고 없는 것만 테이블별 IN 쿼리로 조회
+    coordinates = {}
+    for content_id, row in lookup_card_fields(cursor, connection, content_ids, ['mapx', 'mapy']).items():
+        try:
+            mapx, mapy = float(row['mapx']), float(row['mapy'])
+        except (TypeError, ValueError):
+            continue
+        # 좌표가 0이거나 비어 있으면 경로 계산에서 제외
+        if mapx and mapy and np.isfinite(mapx) and np.isfinite(mapy):
+            coordinates[content_id] = (mapx, mapy)
+    return coordinates
+
+
+def _optimize_route(request: OptimizeRouteRequest):
+    connection = get_db_connection()
+    try:
+        with connection.cursor() as cursor:
+            # 1. 코스 소유권 확인
+            check_course_query = """
+            SELECT * FROM courses WHERE courseId = %s AND userId = %s
+            """
+            cursor.execute(check_course_query, (request.courseId, request.userId))
+            course = cursor.fetchone()
+            if not course:
+                raise HTTPException(status_code=404, detail="Course not found or does not belong to the user.")
+
+            # 2. 코스 일정 전체를 날짜별로 묶기
+            stored_rows = load_plan_rows(cursor, request.courseId)
+            date_buckets = {}
+            desired_rows = []
+            for row in stored_rows:
+                if row['planning_date'] is None:
+                    # 날짜가 없는 행은 어느 날짜에도 속하지 않으므로 최적화하지 않고 그대로 둠
+                    desired_rows.append((None, row['contentId'], row['sequence']))
+                    continue
+                date_buckets.setdefault(row['planning_date'], []).append(row)
+
+            # 3. 좌표 조회 (카드 → DB)
+            content_ids = set(row['contentId'] for rows in date_buckets.values() for row in rows
+                              if row['contentId'] is not None)
+            coordinates = get_coordinates(cursor, connection, content_ids)
+
+            # 4. 날짜별 최적화 (전체 시간 예산을 넘으면 남은 날짜는 최근접 이웃 결과까지만 개선)
+            deadline = time.perf_counter() + ROUTE_TIME_BUDGET
+            start = (request.start.mapx, request.start.mapy) if request.start is not None else None
+            plans = []
+            total_distance = 0.0
+            original_distance = 0.0
+            for plan_date in sorted(date_buckets):
+                stops = [row['contentId'] for row in date_buckets[plan_date] if row['contentId'] is not None]
+                if not stops:
+                    # 콘텐츠가 없는 날짜는 그대로 둠
+                    desired_rows.append((plan_date, None, None))
+                    plans.append({"date": plan_date.strftime("%Y-%m-%d"), "contentIds": [], "legs": [],
+                                  "distance": 0.0, "originalDistance": 0.0})
+                    continue
+
+                located = [content_id for content_id in stops if content_id in coordinates]
+                # 좌표가 없는 콘텐츠는 원래 순서대로 마지막에 붙임
+                unlocated = [content_id for content_id in stops if content_id not in coordinates]
+                mapx = [coordinates[content_id][0] for content_id in located]
+                mapy = [coordinates[content_id][1] for content_id in located]
+                order, leg_distances = optimize_order(mapx, mapy, start, deadline)
+                ordered = [located[index] for index in order] + unlocated
+
+                # 원래 순서의 이동 거리 (같은 기준으로 비교)
+                points = ([start] if start is not None else []) + [coordinates[content_id] for content_id in located]
+                original = path_length(distance_matrix([p[0] for p in points], [p[1] for p in points]),
+                                       np.arange(len(points)))
+                distance = float(sum(leg_distances))
+
+                legs = []
+                previous = None
+                for index, content_id in enumerate(ordered):
+                    leg = leg_distances[index] if index < len(leg_distances) else None
+                    legs.append({
+                        "fromContentId": previous,
+                        "toContentId": content_id,
+                        "distance": round(leg, 3) if leg is not None else None,
+                    })
+                    previous = content_id
+
+                for seq_idx, content_id in enumerate(ordered):
+                    desired_rows.append((plan_date, content_id, seq_idx + 1))  # sequence는 1부터 시작
+                total_distance += distance
+                original_distance += original
+                plans.append({"date": plan_date.strftime("%Y-%m-%d"), "contentIds": ordered, "legs": legs,
+                              "distance": round(distance, 3), "originalDistance": round(original, 3)})
+
+            # 5. 요청 시 바뀐 순서만 저장
+            if request.apply:
+                apply_plan_diff(cursor, request.courseId, diff_plan(stored_rows, desired_rows))
+                connection.commit()
+
+            return {
+                "courseId": request.courseId,
+                "totalDistance": round(total_distance, 3),
+                "originalDistance": round(original_distance, 3),
+                "applied": request.apply,
+                "plans": plans,
+            }
+
+    except pymysql.MySQLError as err:
+        if connection:
+            connection.rollback()
+        print(f"Database Error: {err}")
+        raise HTTPException(status_code=500, detail="Database Error")
+    except HTTPException:
+        if connection:
+            connection.rollback()
+        raise
+    except Exception as e:
+        if connection:
+            connection.rollback()
+        print(f"Error: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+    finally:
+        if connection and connection.open:
+            connection.close()
+
+
+@router.post("/optimize_route", status_code=status.HTTP_200_OK)
+async def optimize_route(request: OptimizeRouteRequest):
+    """
+    코스의 날짜별 방문 순서를 이동 거리가 짧아지도록 재정렬 (haversine 거리 + 최근접 이웃 + 2-opt).
+    start를 주면 매일 그 지점에서 출발하는 것으로 계산하고, apply=True면 결과 순서를 저장한다.
+    """
+    return await run_db(_optimize_route, request)
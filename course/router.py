@@ -3,6 +3,8 @@ from fastapi import FastAPI, HTTPException, APIRouter
 from pydantic import BaseModel
 import os
 import pymysql
+from Database.pool import get_connection
+from Database.executor import run_db
 from course.search import search
 import warnings
 warnings.filterwarnings('ignore')
@@ -11,14 +13,6 @@ load_dotenv()
 
 router = APIRouter()
 
-# MySQL 연결 정보
-MYSQL_HOSTNAME = os.getenv('MYSQL_HOSTNAME')
-MYSQL_PORT = int(os.getenv('MYSQL_PORT'))
-MYSQL_USERNAME = os.getenv('MYSQL_USERNAME')
-MYSQL_PASSWORD = os.getenv('MYSQL_PASSWORD')
-MYSQL_DATABASE = os.getenv('MYSQL_DATABASE')
-
-
 # Pydantic 모델 정의
 class SearchRequest(BaseModel):
     name: str
@@ -26,12 +20,7 @@ class SearchRequest(BaseModel):
 
 # 데이터베이스 연결 함수
 def get_db_connection():
-    connection = pymysql.connect(
-        host=MYSQL_HOSTNAME,
-        port=MYSQL_PORT,
-        user=MYSQL_USERNAME,
-        password=MYSQL_PASSWORD,
-        database=MYSQL_DATABASE,
+    connection = get_connection(
         cursorclass=pymysql.cursors.DictCursor,
         autocommit=True
     )
@@ -39,8 +28,7 @@ def get_db_connection():
 
 
 # search
-@router.get("/search")
-async def search_router(name: str):
+def _search_router(name: str):
     connection = get_db_connection()
     try:
         with connection.cursor() as cursor:
@@ -54,3 +42,8 @@ async def search_router(name: str):
     finally:
         connection.close()
 
+
+@router.get("/search")
+async def search_router(name: str):
+    return await run_db(_search_router, name)
+
@@ -1,27 +1,18 @@
 from fastapi import FastAPI, HTTPException, APIRouter, status, Query
 from datetime import datetime
 import pymysql
+from Database.pool import get_connection
+from Database.executor import run_db
+from travel.catalog import lookup_card_fields
 import os
 from pydantic import BaseModel
 from typing import Dict, List, Optional
 
 router = APIRouter()
 
-# MySQL 연결 정보 (기존과 동일)
-MYSQL_HOSTNAME = os.getenv('MYSQL_HOSTNAME')
-MYSQL_PORT = int(os.getenv('MYSQL_PORT'))
-MYSQL_USERNAME = os.getenv('MYSQL_USERNAME')
-MYSQL_PASSWORD = os.getenv('MYSQL_PASSWORD')
-MYSQL_DATABASE = os.getenv('MYSQL_DATABASE')
-
 # 데이터베이스 연결 함수 (기존과 동일)
 def get_db_connection():
-    connection = pymysql.connect(
-        host=MYSQL_HOSTNAME,
-        port=MYSQL_PORT,
-        user=MYSQL_USERNAME,
-        password=MYSQL_PASSWORD,
-        database=MYSQL_DATABASE,
+    connection = get_connection(
         cursorclass=pymysql.cursors.DictCursor,
         autocommit=False
     )
@@ -35,94 +26,61 @@ class CourseInfo(BaseModel):
     dateCount: int
     firstimage: str  # Optional[str]에서 str로 변경하여 빈 문자열 반환
 
-@router.get("/select", response_model=List[CourseInfo], status_code=status.HTTP_200_OK)
-async def get_courses(userId: int = Query(..., description="User ID")):
+# 코스 목록 + 코스별 콘텐츠 수, 일수, 첫 번째 contentId를 한 번에 집계
+COURSE_SUMMARY_QUERY = """
+SELECT c.courseId, c.courseName,
+       COUNT(cp.contentId) AS contentCount,
+       COUNT(DISTINCT cp.planning_date) AS dateCount,
+       (SELECT p.contentId
+        FROM course_plans p
+        WHERE p.courseId = c.courseId AND p.contentId IS NOT NULL
+        ORDER BY p.planning_date ASC, p.sequence ASC
+        LIMIT 1) AS firstContentId
+FROM courses c
+LEFT JOIN course_plans cp ON cp.courseId = c.courseId
+WHERE c.userId = %s
+GROUP BY c.courseId, c.courseName
+ORDER BY c.courseId DESC
+"""
+
+
+# 첫 번째 콘텐츠들의 대표 이미지 조회 (카탈로그 카드 우선, 없으면 테이블별 IN 쿼리)
+def get_first_images(cursor, connection, content_ids):
+    fields = lookup_card_fields(cursor, connection, content_ids, ['firstimage'])
+    return {content_id: field['firstimage'] for content_id, field in fields.items()}
+
+
+def _get_courses(userId: int, limit: Optional[int] = None, offset: int = 0):
     connection = get_db_connection()
     try:
         with connection.cursor() as cursor:
-            # 1. 해당 사용자의 모든 코스 조회
-            get_courses_query = """
-            SELECT courseId, courseName
-            FROM courses
-            WHERE userId = %s
-            """
-            cursor.execute(get_courses_query, (userId,))
+            # 1. 해당 사용자의 코스와 코스별 집계를 한 번에 조회 (최근 생성 순)
+            summary_query = COURSE_SUMMARY_QUERY
+            params = [userId]
+            if limit is not None:
+                summary_query += " LIMIT %s OFFSET %s"
+                params += [limit, offset]
+            cursor.execute(summary_query, params)
             courses = cursor.fetchall()
 
             if not courses:
                 return []  # 코스가 없으면 빈 리스트 반환
 
+            # 2. 첫 번째 콘텐츠의 대표 이미지 한 번에 조회
+            first_content_ids = [course['firstContentId'] for course in courses if course['firstContentId']]
+            images = get_first_images(cursor, connection, first_content_ids)
+
             course_list = []
             for course in courses:
-                course_id = course['courseId']
-                course_name = course['courseName']
-
-                # 2. 해당 코스에 포함된 contentId의 개수 조회
-                count_query = """
-                SELECT COUNT(*) as contentCount
-                FROM course_plans
-                WHERE courseId = %s AND contentId IS NOT NULL
-                """
-                cursor.execute(count_query, (course_id,))
-                count_result = cursor.fetchone()
-                content_count = count_result['contentCount'] if count_result else 0
-
-                # 3. 해당 코스가 며칠인지 조회
-                date_count_query = """
-                SELECT COUNT(DISTINCT planning_date) as dateCount
-                FROM course_plans
-                WHERE courseId = %s
-                """
-                cursor.execute(date_count_query, (course_id,))
-                datecount_result = cursor.fetchone()
-                date_count = datecount_result['dateCount'] if datecount_result else 0
-
-                # 4. 해당 코스의 첫 번째 contentId 가져오기
-                first_content_query = """
-                SELECT contentId
-                FROM course_plans
-                WHERE courseId = %s AND contentId IS NOT NULL
-                ORDER BY planning_date ASC, sequence ASC
-                LIMIT 1
-                """
-                cursor.execute(first_content_query, (course_id,))
-                first_content = cursor.fetchone()
-
-                first_image = ""
-                if first_content and first_content['contentId']:
-                    content_id = first_content['contentId']
-                    # 4. main_total_v2 테이블에서 target_table 가져오기
-                    cursor.execute("SELECT target_table FROM main_total_v2 WHERE contentsid = %s", (content_id,))
-                    target_result = cursor.fetchone()
-                    if target_result and 'target_table' in target_result:
-                        target_table = target_result['target_table']
-                        # 5. 해당 target_table에서 firstimage 가져오기
-                        allowed_tables = ['visit_main_fix', 'festival_main', 'stay_main',
-                                          'culture_main', 'food_main', 'leports_main', 'shopping_main']
-                        if target_table in allowed_tables:
-                            image_query = f"""
-                            SELECT firstimage
-                            FROM {target_table}
-                            WHERE contentid = %s
-                            """
-                            cursor.execute(image_query, (content_id,))
-                            image_result = cursor.fetchone()
-                            if image_result and image_result['firstimage']:
-                                first_image = image_result['firstimage']
-                            else:
-                                first_image = ""
-                    else:
-                        first_image = ""
-                else:
-                    first_image = ""
+                first_image = images.get(course['firstContentId']) if course['firstContentId'] else None
 
                 # 결과 추가
                 course_info = CourseInfo(
-                    courseId=course_id,
-                    courseName=course_name,
-                    contentCount=content_count,
-                    dateCount=date_count,
-                    firstimage=first_image
+                    courseId=course['courseId'],
+                    courseName=course['courseName'],
+                    contentCount=course['contentCount'] or 0,
+                    dateCount=course['dateCount'] or 0,
+                    firstimage=first_image if isinstance(first_image, str) and first_image else ""
                 )
                 course_list.append(course_info)
 
@@ -140,4 +98,11 @@ async def get_courses(userId: int = Query(..., description="User ID")):
         raise HTTPException(status_code=500, detail="Internal Server Error")
     finally:
         if connection and connection.open:
-            connection.close()
\ No newline at end of file
+            connection.close()
+
+
+@router.get("/select", response_model=List[CourseInfo], status_code=status.HTTP_200_OK)
+async def get_courses(userId: int = Query(..., description="User ID"),
+                      limit: Optional[int] = Query(None, ge=1, description="Page size"),
+                      offset: int = Query(0, ge=0, description="Page offset")):
+    return await run_db(_get_courses, userId, limit, offset)
\ No newline at end of file
@@ -1,9 +1,11 @@
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, APIRouter
-from fastapi.responses import JSONResponse
+from common.responses import JSONResponse
 from pydantic import BaseModel, Field, validator
 import os
 import pymysql
+from Database.pool import get_connection
+from Database.executor import run_db
 import pandas as pd
 from math import radians, cos, sin, asin, sqrt
 from datetime import datetime
@@ -15,12 +17,6 @@ load_dotenv()
 app = FastAPI()
 router = APIRouter()
 
-MYSQL_HOSTNAME = os.getenv('MYSQL_HOSTNAME')
-MYSQL_PORT = int(os.getenv('MYSQL_PORT'))
-MYSQL_USERNAME = os.getenv('MYSQL_USERNAME')
-MYSQL_PASSWORD = os.getenv('MYSQL_PASSWORD')
-MYSQL_DATABASE = os.getenv('MYSQL_DATABASE')
-
 # Pydantic 모델 정의
 class RecommendationInput(BaseModel):
     userId: int = Field(..., example=1)
@@ -34,13 +30,7 @@ class RecommendationOutput(BaseModel):
 # 데이터베이스 연결 및 쿼리 실행 함수
 def connect_mysql(query, params=None):
     try:
-        connection = pymysql.connect(
-            host=MYSQL_HOSTNAME,
-            port=MYSQL_PORT,
-            user=MYSQL_USERNAME,
-            password=MYSQL_PASSWORD,
-            database=MYSQL_DATABASE
-        )
+        connection = get_connection()
         # print(f"Executing query: {query} with params: {params}")  # 디버깅용 로그
         df = pd.read_sql(query, connection, params=params)
         # print(f"DataFrame head:\n{df.head()}")  # 데이터 확인용 로그
@@ -54,8 +44,7 @@ def connect_mysql(query, params=None):
         connection.close()
 
 
-@router.post("/recommendation", response_model=RecommendationOutput)
-async def get_recommendation(input_data: RecommendationInput):
+def _get_recommendation(input_data: RecommendationInput):
     userId = input_data.userId
     mapx = input_data.mapx
     mapy = input_data.mapy
@@ -108,13 +97,7 @@ async def get_recommendation(input_data: RecommendationInput):
                      address, firstimage, story, datetime.utcnow())
 
     try:
-        connection = pymysql.connect(
-            host=MYSQL_HOSTNAME,
-            port=MYSQL_PORT,
-            user=MYSQL_USERNAME,
-            password=MYSQL_PASSWORD,
-            database=MYSQL_DATABASE,
-        )
+        connection = get_connection()
         with connection.cursor() as cursor:
             cursor.execute(insert_query, insert_params)
         connection.commit()
@@ -129,3 +112,8 @@ async def get_recommendation(input_data: RecommendationInput):
     # 결과 반환
     return RecommendationOutput(contentid=contentid, title=title)
 
+
+@router.post("/recommendation", response_model=RecommendationOutput)
+async def get_recommendation(input_data: RecommendationInput):
+    return await run_db(_get_recommendation, input_data)
+
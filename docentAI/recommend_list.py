@@ -1,9 +1,11 @@
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, APIRouter
-from fastapi.responses import JSONResponse
+from common.responses import JSONResponse, df_to_records
 from pydantic import BaseModel, Field, validator
 import os
 import pymysql
+from Database.pool import get_connection
+from Database.executor import run_db
 import pandas as pd
 from math import radians, cos, sin, asin, sqrt
 from datetime import datetime
@@ -15,29 +17,16 @@ load_dotenv()
 app = FastAPI()
 router = APIRouter()
 
-MYSQL_HOSTNAME = os.getenv('MYSQL_HOSTNAME')
-MYSQL_PORT = int(os.getenv('MYSQL_PORT'))
-MYSQL_USERNAME = os.getenv('MYSQL_USERNAME')
-MYSQL_PASSWORD = os.getenv('MYSQL_PASSWORD')
-MYSQL_DATABASE = os.getenv('MYSQL_DATABASE')
-
 # 데이터베이스 연결 함수
 def connect_mysql():
     try:
-        connection = pymysql.connect(
-            host=MYSQL_HOSTNAME,
-            port=MYSQL_PORT,
-            user=MYSQL_USERNAME,
-            password=MYSQL_PASSWORD,
-            database=MYSQL_DATABASE
-        )
+        connection = get_connection()
         return connection
     except Exception as e:
         print(f"Database connection error: {str(e)}")
         raise HTTPException(status_code=500, detail="Database connection failed.")
 
-@router.get("/user_recommendations/{userId}")
-async def get_user_recommendations(userId: int):
+def _get_user_recommendations(userId: int):
     # 중복된 contentid를 제외하고 해당 유저가 추천받은 관광지를 가져오는 쿼리
     query = """
         SELECT userId, contentid, title, mapx, mapy, address, firstimage, story
@@ -57,7 +46,7 @@ async def get_user_recommendations(userId: int):
         df = df.drop_duplicates(['userId','contentid'], keep='first')
 
         # DataFrame을 JSON으로 변환하여 반환
-        recommendations = df.to_dict(orient="records")
+        recommendations = df_to_records(df)
         return JSONResponse(content=recommendations)
 
     except pymysql.MySQLError as e:
@@ -66,4 +55,9 @@ async def get_user_recommendations(userId: int):
 
     except Exception as e:
         print(f"Unexpected error: {str(e)}")
-        raise HTTPException(status_code=500, detail="An unexpected error occurred.")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="An unexpected error occurred.")
+
+
+@router.get("/user_recommendations/{userId}")
+async def get_user_recommendations(userId: int):
+    return await run_db(_get_user_recommendations, userId)
\ No newline at end of file
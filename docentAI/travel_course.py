@@ -1,10 +1,14 @@
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, APIRouter
-from fastapi.responses import JSONResponse
+from common.responses import JSONResponse, df_to_records
+from fastapi.concurrency import run_in_threadpool
 from typing import List
 from pydantic import BaseModel, Field, validator
 import os
 import pymysql
+from Database.pool import get_connection
+from Database.executor import run_db
+from travel.like_state import get_liked_content_ids
 import pandas as pd
 import numpy as np
 import ast
@@ -21,14 +25,6 @@ router = APIRouter()
 # GPT API 클라이언트 초기화
 CLIENT = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
-# MySQL 연결 정보
-MYSQL_HOSTNAME = os.getenv('MYSQL_HOSTNAME')
-MYSQL_PORT = int(os.getenv('MYSQL_PORT'))
-MYSQL_USERNAME = os.getenv('MYSQL_USERNAME')
-MYSQL_PASSWORD = os.getenv('MYSQL_PASSWORD')
-MYSQL_DATABASE = os.getenv('MYSQL_DATABASE')
-
-
 # 요청 본문 모델 정의
 class RecommendTravelRequest(BaseModel):
     userId: int
@@ -57,19 +53,24 @@ def call_csv():
 # 데이터베이스 연결 함수
 def connect_mysql():
     try:
-        connection = pymysql.connect(
-            host=MYSQL_HOSTNAME,
-            port=MYSQL_PORT,
-            user=MYSQL_USERNAME,
-            password=MYSQL_PASSWORD,
-            database=MYSQL_DATABASE
-        )
+        connection = get_connection()
         return connection
     except Exception as e:
         print(f"Database connection error: {str(e)}")
         raise HTTPException(status_code=500, detail="Database connection failed.")
 
 
+# 온보딩 테이블에서 유저의 연령대와 성별 조회
+def get_user_age_gender(user_id):
+    connection = connect_mysql()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT ageRange, gender FROM onboarding_info WHERE userId = %s", (user_id,))
+            return cursor.fetchone()
+    finally:
+        connection.close()
+
+
 # Function to calculate Euclidean distance between two points
 def euclidean_distance(x1, y1, x2, y2):
     return np.sqrt((x1 - x2) ** 2 + (y1 - y2) ** 2)
@@ -297,10 +298,7 @@ async def recommend_travel(request: RecommendTravelRequest):
         }
 
         # 1. 유저 정보를 온보딩 테이블에서 조회
-        connection = connect_mysql()
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT ageRange, gender FROM onboarding_info WHERE userId = %s", (request.userId,))
-            user_data = cursor.fetchone()
+        user_data = await run_db(get_user_age_gender, request.userId)
         if user_data is None:
             raise HTTPException(status_code=404, detail="User not found")
 
@@ -311,17 +309,21 @@ async def recommend_travel(request: RecommendTravelRequest):
         gender = GENDER_MAPPING.get(gender_numeric, "Unknown")
 
         # 3. 여행지 추천 로직 실행
-        df = call_csv()
+        df = await run_in_threadpool(call_csv)
         if request.location != '내 위치':
             target_x, target_y = locations[request.location]["경도"], locations[request.location]["위도"]
         else:
             target_x, target_y = request.mapx, request.mapy
 
-        filtered_df, distance = find_locations_within_k(df, request.traveltheme, 'mapx', 'mapy', target_x, target_y, 50, 10)
+        filtered_df, distance = await run_in_threadpool(
+            find_locations_within_k, df, request.traveltheme, 'mapx', 'mapy', target_x, target_y, 50, 10)
         if filtered_df is None or filtered_df.empty:
             raise HTTPException(status_code=404, detail="No travel spots found")
 
-        result = recommend_travel_spots(request.persona, age, gender, request.season, request.duration, request.travelmate, filtered_df, "gpt-4o", CLIENT)
+        # GPT 호출은 DB 스레드풀을 점유하지 않도록 기본 스레드풀에서 실행
+        result = await run_in_threadpool(
+            recommend_travel_spots, request.persona, age, gender, request.season, request.duration,
+            request.travelmate, filtered_df, "gpt-4o", CLIENT)
         print(result)
         # GPT의 응답에서 유효한 JSON 추출
         # try:
@@ -346,28 +348,16 @@ async def recommend_travel(request: RecommendTravelRequest):
 
         output_travel_df = filtered_df[filtered_df['contentsid'].isin(ids)][['contentsid','title','address','firstimage']]
 
-        # 좋아요 상태를 가져오는 쿼리
-        like_query = """
-                       SELECT contentId
-                       FROM likes
-                       WHERE userId = %s AND contentId IN %s
-                       """
-
-        # IN 연산자를 사용하기 위해 튜플 형태로 변환
-        content_ids_tuple = tuple(ids)
-        if len(content_ids_tuple) == 1:
-            content_ids_tuple += (None,)  # 단일 요소 튜플일 경우 콤마 추가
-
         # 좋아요 상태를 가져옴
-        df_likes = pd.read_sql(like_query, connection, params=(request.userId, content_ids_tuple))
+        liked_ids = await run_db(get_liked_content_ids, request.userId, ids)
 
         # 좋아요 상태를 표시하기 위한 컬럼 추가
-        output_travel_df['is_liked'] = output_travel_df['contentsid'].isin(df_likes['contentId'])
+        output_travel_df['is_liked'] = output_travel_df['contentsid'].isin(liked_ids)
         output_travel_df = output_travel_df.rename(columns = {'contentsid':'contentid'})
         output_travel_df['contentid'] = output_travel_df['contentid'].astype(int)
 
 
-        ouput_travel_result = json.loads(output_travel_df.to_json(orient='records', force_ascii=False))
+        ouput_travel_result = df_to_records(output_travel_df)
 
         return {"recommendation": response,
                 "items": ouput_travel_result}
@@ -378,7 +368,3 @@ async def recommend_travel(request: RecommendTravelRequest):
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-
-    finally:
-        if connection:
-            connection.close()
@@ -3,6 +3,8 @@ from fastapi import FastAPI, HTTPException, APIRouter
 from pydantic import BaseModel
 import os
 import pymysql
+from Database.pool import get_connection
+from Database.executor import run_db
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -10,31 +12,16 @@ load_dotenv()
 
 router = APIRouter()
 
-# MySQL 연결 정보
-MYSQL_HOSTNAME = os.getenv('MYSQL_HOSTNAME')
-MYSQL_PORT = int(os.getenv('MYSQL_PORT'))
-MYSQL_USERNAME = os.getenv('MYSQL_USERNAME')
-MYSQL_PASSWORD = os.getenv('MYSQL_PASSWORD')
-MYSQL_DATABASE = os.getenv('MYSQL_DATABASE')
-
-
 # Pydantic 모델 정의
 class UserInfo(BaseModel):
     id: int
 
 
 # 데이터 삽입 엔드포인트
-@router.post("/user_info")
-async def create_user_info(user_info: UserInfo):
+def _create_user_info(user_info: UserInfo):
     try:
-        # MySQL에 직접 연결
-        connection = pymysql.connect(
-            host=MYSQL_HOSTNAME,
-            port=MYSQL_PORT,
-            user=MYSQL_USERNAME,
-            password=MYSQL_PASSWORD,
-            database=MYSQL_DATABASE
-        )
+        # 풀에서 연결 대여
+        connection = get_connection()
 
         with connection.cursor() as cursor:
             add_user = "INSERT INTO user_info (id) VALUES (%s)"
@@ -50,19 +37,16 @@ async def create_user_info(user_info: UserInfo):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.delete("/user_info/{user_id}")
-async def delete_user_info(user_id: int):
+@router.post("/user_info")
+async def create_user_info(user_info: UserInfo):
+    return await run_db(_create_user_info, user_info)
+
+
+def _delete_user_info(user_id: int):
     connection = None
     try:
-        # MySQL에 직접 연결
-        connection = pymysql.connect(
-            host=MYSQL_HOSTNAME,
-            port=MYSQL_PORT,
-            user=MYSQL_USERNAME,
-            password=MYSQL_PASSWORD,
-            database=MYSQL_DATABASE,
-            autocommit=False  # 자동 커밋 비활성화
-        )
+        # 풀에서 연결 대여
+        connection = get_connection(autocommit=False)
 
         with connection.cursor() as cursor:
             # 사용자 존재 여부 확인
@@ -104,4 +88,9 @@ async def delete_user_info(user_id: int):
         raise HTTPException(status_code=500, detail=str(e))
     finally:
         if connection and connection.open:
-            connection.close()
\ No newline at end of file
+            connection.close()
+
+
+@router.delete("/user_info/{user_id}")
+async def delete_user_info(user_id: int):
+    return await run_db(_delete_user_info, user_id)
\ No newline at end of file
@@ -4,6 +4,8 @@ from pydantic import BaseModel, ValidationError
 from typing import Union
 import os
 import pymysql
+from Database.pool import get_connection
+from Database.executor import run_db
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -12,33 +14,19 @@ load_dotenv()
 app = FastAPI()
 router = APIRouter()
 
-# MySQL 연결 정보
-MYSQL_HOSTNAME = os.getenv('MYSQL_HOSTNAME')
-MYSQL_PORT = int(os.getenv('MYSQL_PORT'))
-MYSQL_USERNAME = os.getenv('MYSQL_USERNAME')
-MYSQL_PASSWORD = os.getenv('MYSQL_PASSWORD')
-MYSQL_DATABASE = os.getenv('MYSQL_DATABASE')
-
 # Pydantic 모델 정의
 class UserInfo(BaseModel):
     id: Union[int, str]  # id가 숫자가 아닐 경우를 대비해 Union[int, str] 사용
 
 # 유저 정보 조회 엔드포인트
-@router.post("/check_user")
-async def check_user_info(user_info: UserInfo):
+def _check_user_info(user_info: UserInfo):
     # id가 숫자가 아닌 경우 예외 처리
     if not isinstance(user_info.id, int):
         raise HTTPException(status_code=422, detail="Invalid input type. 'id' must be an integer.")
 
     try:
-        # MySQL에 직접 연결
-        connection = pymysql.connect(
-            host=MYSQL_HOSTNAME,
-            port=MYSQL_PORT,
-            user=MYSQL_USERNAME,
-            password=MYSQL_PASSWORD,
-            database=MYSQL_DATABASE
-        )
+        # 풀에서 연결 대여
+        connection = get_connection()
 
         with connection.cursor() as cursor:
             check_user_query = "SELECT id FROM user_info WHERE id = %s"
@@ -69,5 +57,10 @@ async def check_user_info(user_info: UserInfo):
         connection.close()
 
 
+@router.post("/check_user")
+async def check_user_info(user_info: UserInfo):
+    return await run_db(_check_user_info, user_info)
+
+
 # 라우터를 FastAPI 애플리케이션에 포함
 app.include_router(router)
\ No newline at end of file
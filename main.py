@@ -1,4 +1,5 @@
 from fastapi import FastAPI
+from common.responses import JSONResponse
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -15,6 +16,7 @@ from travel.call_main_page_items import router as main_layout
 from travel.call_travel_item_details import router as details_layout
 from travel.likes import router as like_router
 from travel.main_category_items import router as category
+from travel.map_clusters import router as map_clusters
 
 # AIdocent 관련 라우터 임포트
 from docentAI.nearby_spot_title import router as docent_nearby
@@ -29,9 +31,20 @@ from course.insert import router as insert_course_router
 from course.detail import router as detail_course_router
 from course.update import router as update_course_info_router
 from course.update_course_sequence import router as update_course_plan_router
+from course.route_optimizer import router as route_optimizer_router
 
+# DB 관련 라우터 임포트
+from Database.pool import close_pool
+from Database.executor import shutdown_executor
+from Database.pool_status import router as db_pool_status
+from travel.like_counter import stop_like_counter
+from travel.target_table import warm_target_tables
+from travel.catalog import get_catalog, get_card_lookup
+from travel.detail_index import get_detail_index
 
-app = FastAPI()
+
+# 모든 엔드포인트의 기본 응답을 orjson으로 직렬화
+app = FastAPI(default_response_class=JSONResponse)
 
 # 각각의 라우터를 등록
 app.include_router(user_info_router, prefix="/jeju")
@@ -44,6 +57,7 @@ app.include_router(receive_onboarding_info, prefix="/jeju")
 
 app.include_router(like_router, prefix="/jeju")
 app.include_router(category, prefix="/jeju")
+app.include_router(map_clusters, prefix="/jeju")
 app.include_router(docent_nearby, prefix="/jeju")
 app.include_router(recommend_list, prefix="/jeju")
 app.include_router(recommend_travel, prefix="/jeju")
@@ -58,6 +72,34 @@ app.include_router(insert_course_router, prefix="/jeju/course")
 app.include_router(detail_course_router, prefix="/jeju/course")
 app.include_router(update_course_info_router, prefix="/jeju/course")
 app.include_router(update_course_plan_router, prefix="/jeju/course")
+app.include_router(route_optimizer_router, prefix="/jeju/course")
+
+app.include_router(db_pool_status, prefix="/jeju")
+
+
+@app.on_event("startup")
+def warm_snapshots():
+    # 핸들러는 연결을 대여한 상태에서 스냅샷을 조회하므로, 첫 로드가 요청 중에 일어나면
+    # 로더가 연결을 하나 더 기다리다 풀이 바닥날 수 있음 → 서비스 전에 미리 로드
+    warmers = (
+        ('target_table', warm_target_tables),
+        ('catalog', lambda: get_card_lookup(get_catalog())),
+        ('detail_index', get_detail_index),
+    )
+    for name, warm in warmers:
+        try:
+            warm()
+        except Exception as e:
+            # 실패하면 기존처럼 첫 요청에서 로드
+            print(f"Error warming {name} snapshot: {str(e)}")
+
+
+@app.on_event("shutdown")
+def shutdown_db_pool():
+    # 모아 둔 좋아요 수 변경분을 먼저 반영한 뒤 풀을 닫음
+    stop_like_counter()
+    shutdown_executor()
+    close_pool()
 
 if __name__ == "__main__":
     import uvicorn
@@ -3,6 +3,8 @@ from fastapi import FastAPI, HTTPException, status, APIRouter
 from pydantic import BaseModel
 import os
 import pymysql
+from Database.pool import get_connection
+from Database.executor import run_db
 from typing import List
 import json
 import warnings
@@ -12,13 +14,6 @@ load_dotenv()
 
 router = APIRouter()
 
-# MySQL 연결 정보
-MYSQL_HOSTNAME = os.getenv('MYSQL_HOSTNAME')
-MYSQL_PORT = int(os.getenv('MYSQL_PORT'))
-MYSQL_USERNAME = os.getenv('MYSQL_USERNAME')
-MYSQL_PASSWORD = os.getenv('MYSQL_PASSWORD')
-MYSQL_DATABASE = os.getenv('MYSQL_DATABASE')
-
 def save_onboarding_info(user_id: int, age_range: int, gender: int, travel_type: List[str]):
     # 여행 타입 매핑 딕셔너리 정의
     travel_type_mapping = {
@@ -41,13 +36,7 @@ def save_onboarding_info(user_id: int, age_range: int, gender: int, travel_type:
 
     connection = None
     try:
-        connection = pymysql.connect(
-            host=MYSQL_HOSTNAME,
-            port=MYSQL_PORT,
-            user=MYSQL_USERNAME,
-            password=MYSQL_PASSWORD,
-            database=MYSQL_DATABASE
-        )
+        connection = get_connection()
 
         with connection.cursor() as cursor:
             add_user = "INSERT INTO onboarding_info (userId, ageRange, gender, travelType) VALUES (%s, %s, %s, %s)"
@@ -79,7 +68,8 @@ async def receive_onboarding_info(info: OnboardingInfo):
     유저의 온보딩 정보를 수신하고 데이터베이스에 저장합니다.
     """
     try:
-        save_onboarding_info(
+        await run_db(
+            save_onboarding_info,
             user_id=info.userId,
             age_range=info.ageRange,
             gender=info.gender,
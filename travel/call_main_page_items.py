@@ -1,14 +1,16 @@
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, APIRouter
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter
+from common.responses import JSONResponse, df_to_records
 import os
-from sshtunnel import SSHTunnelForwarder
-import pymysql
+import asyncio
 import pandas as pd
-import requests
-from copy import deepcopy
+from Database.pool import get_connection
+from Database.executor import run_db
+from travel.catalog import get_catalog
+from travel.tag_index import build_tag_index
+from travel.like_state import get_liked_content_ids, mark_liked
+from travel.leaderboard import get_famous_spots
 import json
-import ast
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -16,72 +18,26 @@ load_dotenv()
 
 router = APIRouter()
 
-MYSQL_HOSTNAME = os.getenv('MYSQL_HOSTNAME')
-MYSQL_PORT = int(os.getenv('MYSQL_PORT'))
-MYSQL_USERNAME = os.getenv('MYSQL_USERNAME')
-MYSQL_PASSWORD = os.getenv('MYSQL_PASSWORD')
-MYSQL_DATABASE = os.getenv('MYSQL_DATABASE')
+# 메인 페이지 섹션별 최대 대기 시간(초)
+MAIN_SECTION_TIMEOUT = float(os.getenv('MAIN_SECTION_TIMEOUT', '3'))
 
 def connect_mysql(query):
     try:
-        connection = pymysql.connect(
-            host=MYSQL_HOSTNAME,
-            port=MYSQL_PORT,
-            user=MYSQL_USERNAME,
-            password=MYSQL_PASSWORD,
-            database=MYSQL_DATABASE
-        )
-        # 쿼리를 실행하여 데이터를 가져오기
-        df = pd.read_sql(query, connection)
+        with get_connection() as connection:
+            # 쿼리를 실행하여 데이터를 가져오기
+            df = pd.read_sql(query, connection)
         return df
 
     except Exception as e:
         print(f"Error: {str(e)}")
         return pd.DataFrame()  # 오류 발생 시 빈 DataFrame 반환
 
-    finally:
-        connection.close()
 
+# 추천 함수 (태그 역색인 조회 + 상위 20개 선택)
+def recommend_tourist_spots(user_tags, tag_index):
+    positions = tag_index.top_k(user_tags, 20)
 
-# 문자열을 리스트로 변환하는 함수
-def convert_string_to_list(tag_string):
-    # ast.literal_eval로 문자열을 리스트로 변환
-    if not tag_string:
-        return []
-    if isinstance(tag_string, list):
-        return tag_string
-    if isinstance(tag_string, str):
-        tag_string = tag_string.strip()
-        # Try to parse with json.loads
-        try:
-            return json.loads(tag_string)
-        except json.JSONDecodeError:
-            pass
-        # Try to parse with ast.literal_eval
-        try:
-            return ast.literal_eval(tag_string)
-        except (ValueError, SyntaxError):
-            pass
-        # If all else fails, assume it's a comma-separated string
-        return [tag.strip() for tag in tag_string.split(',')]
-    return []
-
-
-# 추천 함수
-def recommend_tourist_spots(user_tags, df):
-    df = df[df['tag'].notnull()]
-
-    df['tag'] = df['tag'].apply(convert_string_to_list)
-    df['tag'] = df['tag'].apply(lambda x : ast.literal_eval(x))
-
-    # 일치하는 태그 개수를 저장할 리스트
-    df['tag_match_count'] = df['tag'].apply(lambda tags: len(set(tags) & set(user_tags)))
-
-    # 일치하는 태그 개수와 리뷰 수를 기준으로 정렬 (태그 개수 내림차순 -> 리뷰 수 내림차순)
-    sorted_df = df.sort_values(by=['tag_match_count', 'review_count'], ascending=[False, False])
-
-    # 태그 매칭 개수가 0인 행은 제외
-    recommended_spots = sorted_df[sorted_df['tag_match_count'] > 0]
+    recommended_spots = tag_index.df.iloc[positions]
 
     # 결과 출력
     result = recommended_spots[['contentid', 'title', 'cat2', 'cat3', 'firstimage', 'address']].reset_index(
@@ -91,13 +47,14 @@ def recommend_tourist_spots(user_tags, df):
 
     return result, result2
 
-def famous_tourist_spots(df, topic):
-    df = df.copy()
-    df['type'] = topic
-    if (df['like_count']==0).all():
-        return df.sample(min(len(df), 5))[['type','contentid','title','cat2','cat3','firstimage','address','mapx','mapy']]
-    else:
-        return df.sort_values(['like_count'],ascending=False).head(5)[['type','contentid','title','cat2','cat3','firstimage','address','mapx','mapy']]
+# 전망 좋은 맛집/카페 후보 (view5)
+def build_view_food(catalog):
+    df_food = pd.concat([catalog.df_restaurant, catalog.df_cafe], axis=0)
+    return df_food[df_food['summary'].apply(lambda x: '뷰' in x)]
+
+# 좋아요/리뷰 상위 50개 관광지 (view6)
+def build_popular_top50(catalog):
+    return catalog.df_fix.sort_values(['like_count', 'review_count'], ascending=[False, False]).head(50)
 
 # 사용자 온보딩 정보를 가져오는 함수 (예시)
 def get_user_onboarding_info(user_id):
@@ -118,123 +75,101 @@ def get_user_onboarding_info(user_id):
             # Handle error if travelType is not valid JSON
             return []
 
-# 좋아요 상태를 추가하는 함수
-def add_is_liked_column(df, user_id):
-    if df.empty:
-        df['is_liked'] = []
-        return df
+# view1: 대표 관광지 1개
+def build_view1(catalog):
+    content1_df = catalog.df_fix.sample(1)[['contentid', 'title', 'firstimage']]
+    return df_to_records(content1_df)
+
+
+# view2, view4: 온보딩 태그 기반 맞춤 추천
+def build_recommend_views(user_id, catalog):
+    # 사용자 온보딩 정보 가져오기
+    user_tags = get_user_onboarding_info(user_id)
+    content2_df, content4_df = recommend_tourist_spots(user_tags, catalog.derived('tag_index', build_tag_index))
+    return df_to_records(content2_df), df_to_records(content4_df)
+
 
-    content_ids = df['contentid'].tolist()
+# view3: 테마별 인기 관광지 (미리 정렬된 리더보드에서 상위 5개씩)
+def build_view3(catalog):
+    return get_famous_spots(catalog)
 
-    content_ids_tuple = tuple(content_ids)
-    if len(content_ids_tuple) == 1:
-        content_ids_tuple += (None,)
 
-    like_query = """
-        SELECT contentId
-        FROM likes
-        WHERE userId = %s AND contentId IN %s
+# view5: 전망 좋은 맛집/카페 1개
+def build_view5(catalog):
+    # 스냅샷당 한 번만 계산되는 후보군
+    df_view_food = catalog.derived('view_food', build_view_food)
+    content5_df = df_view_food.sample(1)[
+        ['contentid', 'title', 'cat2', 'cat3', 'firstimage', 'address', 'mapx', 'mapy']]
+    return df_to_records(content5_df)
+
+
+# view6: 인기 상위 50개 중 5개
+def build_view6(catalog):
+    content6_df = catalog.derived('popular_top50', build_popular_top50).sample(5)[['contentid', 'title', 'firstimage']]
+    return df_to_records(content6_df)
+
+
+# 섹션별 마지막 정상 결과 (사용자 공통 섹션만 보관, 타임아웃/오류 시 대체값으로 사용)
+_last_good_sections = {}
+
+
+def build_section(name, builder, catalog):
     """
+    스냅샷만 쓰는 공통 섹션을 바로 만들어 반환한다 (I/O가 없으므로 DB 스레드풀을 쓰지 않음).
+    실패하면 마지막 정상 결과(없으면 빈 목록)를 돌려준다.
+    """
+    try:
+        result = builder(catalog)
+    except Exception as e:
+        print(f"Error building main section {name}: {e!r}")
+        return _last_good_sections.get(name, [])
+    _last_good_sections[name] = result
+    return result
 
+
+async def load_section(name, builder, *args, fallback=None):
+    """
+    DB 조회가 필요한 섹션을 DB 스레드풀에서 MAIN_SECTION_TIMEOUT 안에 만들어 반환한다.
+    실패하면 fallback(빈 값)을 돌려준다.
+    """
     try:
-        connection = pymysql.connect(
-            host=MYSQL_HOSTNAME,
-            port=MYSQL_PORT,
-            user=MYSQL_USERNAME,
-            password=MYSQL_PASSWORD,
-            database=MYSQL_DATABASE
-        )
-        df_likes = pd.read_sql(like_query, connection, params=(user_id, content_ids_tuple))
-        df['is_liked'] = df['contentid'].isin(df_likes['contentId'])
+        return await asyncio.wait_for(run_db(builder, *args), MAIN_SECTION_TIMEOUT)
     except Exception as e:
-        print(f"Error fetching likes: {str(e)}")
-        df['is_liked'] = False
-    finally:
-        connection.close()
+        print(f"Error building main section {name}: {e!r}")
+        return fallback
 
-    return df
 
 @router.get("/main/{user_id}")
 async def read_main_items(user_id: int):
-
-    # 사용자 온보딩 정보 가져오기
-    user_tags = get_user_onboarding_info(user_id)
-
-    df_fix = connect_mysql("""SELECT * 
-                FROM visit_main_fix 
-                WHERE firstimage is not null 
-                AND firstimage not in ('', ' ', 'None')
-                AND contentid is not null
-                AND tag is not null""")
-
-    content1_df = df_fix.sample(1)[['contentid', 'title', 'firstimage']]
-    content2_df, content4_df = recommend_tourist_spots(user_tags, df_fix)
-
-    # 좋아요 상태 추가
-    content2_df = add_is_liked_column(content2_df, user_id)
-    content4_df = add_is_liked_column(content4_df, user_id)
-
-    df_sea = df_fix[df_fix['cat3'].isin(['해수욕장', '섬', '해안절경', '등대', '항구/포구'])]
-    df_healing = df_fix[df_fix['tag'].apply(lambda x: '힐링' in x)]
-
-    content3_1_df = famous_tourist_spots(df_sea,'바다')
-    content3_5_df = famous_tourist_spots(df_healing,'힐링')
-
-    df_festival = connect_mysql(
-        """select * from festival_main 
-            where cat2='축제' 
-            and firstimage is not null 
-            and firstimage not in ('',' ', 'None') 
-            and contentid is not null
-            and eventstartdate > CURDATE()""")
-    content3_2_df = famous_tourist_spots(df_festival,'축제')
-
-    df_restaurant = connect_mysql(
-        """select * from food_main 
-            where cat3 not in ('카페/전통찻집') 
-            and firstimage is not null 
-            and firstimage not in ('',' ', 'None') 
-            and contentid is not null""")
-
-    df_cafe = connect_mysql(
-        """select * from food_main 
-            where cat3 = '카페/전통찻집' 
-            and firstimage is not null 
-            and firstimage not in ('',' ', 'None') 
-            and contentid is not null""")
-
-    content3_4_df = famous_tourist_spots(df_restaurant,'맛집')
-    content3_3_df = famous_tourist_spots(df_cafe,'카페')
-
-    df_hotel = connect_mysql(
-        """select * from stay_main 
-            where cat3 in ('관광호텔', '콘도미니엄')
-            and firstimage is not null 
-            and firstimage not in ('',' ', 'None') 
-            and contentid is not null""")
-
-    content3_6_df = famous_tourist_spots(df_hotel,'호캉스')
-
-    content3_df = pd.concat([content3_1_df, content3_2_df, content3_3_df,
-                             content3_4_df, content3_5_df, content3_6_df],
-                            axis=0)
-
-    df_food = pd.concat([df_restaurant, df_cafe], axis=0)
-    content5_df = df_food[df_food['summary'].apply(lambda x: '뷰' in x)].sample(1)[
-        ['contentid', 'title', 'cat2', 'cat3', 'firstimage', 'address', 'mapx', 'mapy']]
-
-    # 좋아요 상태 추가
-    content5_df = add_is_liked_column(content5_df, user_id)
-
-    content6_df = df_fix.sort_values(['like_count', 'review_count'], ascending=[False, False]).head(50).sample(5)[['contentid', 'title', 'firstimage']]
+    # 프로세스 메모리의 카탈로그 스냅샷 사용 (주기적으로 백그라운드 갱신)
+    catalog = await run_db(get_catalog)
+
+    # 온보딩 조회가 필요한 개인화 섹션만 DB 스레드풀에서 실행하고, 그동안 스냅샷 섹션을 바로 구성
+    recommend = asyncio.ensure_future(
+        load_section('recommend', build_recommend_views, user_id, catalog, fallback=([], [])))
+    view1 = build_section('view1', build_view1, catalog)
+    view3 = build_section('view3', build_view3, catalog)
+    view5 = build_section('view5', build_view5, catalog)
+    view6 = build_section('view6', build_view6, catalog)
+    view2, view4 = await recommend
+
+    # 화면에 노출되는 모든 contentId의 좋아요 상태를 한 번의 쿼리로 조회
+    liked_views = [view2, view4, view5]
+    content_ids = [record['contentid'] for records in liked_views for record in records]
+    try:
+        liked_ids = await asyncio.wait_for(run_db(get_liked_content_ids, user_id, content_ids), MAIN_SECTION_TIMEOUT)
+    except Exception as e:
+        print(f"Error fetching likes: {e!r}")
+        liked_ids = set()
+    view2, view4, view5 = mark_liked(liked_views, liked_ids)
 
     json_output = {
-        "view1": json.loads(content1_df.to_json(orient='records', force_ascii=False)),
-        "view2": json.loads(content2_df.to_json(orient='records', force_ascii=False)),
-        "view3": json.loads(content3_df.to_json(orient='records', force_ascii=False)),
-        "view4": json.loads(content4_df.to_json(orient='records', force_ascii=False)),
-        "view5": json.loads(content5_df.to_json(orient='records', force_ascii=False)),
-        "view6": json.loads(content6_df.to_json(orient='records', force_ascii=False))
+        "view1": view1,
+        "view2": view2,
+        "view3": view3,
+        "view4": view4,
+        "view5": view5,
+        "view6": view6
     }
 
     # JSON 응답을 반환
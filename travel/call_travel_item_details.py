@@ -1,15 +1,26 @@
+import asyncio
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, APIRouter
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, APIRouter, Header
+from fastapi.responses import Response
+from common.lru import LRUCache
+from common.responses import JSONResponse, content_digest, df_to_records, etag_matches
 import os
 from sshtunnel import SSHTunnelForwarder
 import pymysql
 import numpy as np
 import pandas as pd
+from Database.pool import get_connection
+from Database.executor import run_db
+from travel.catalog import get_catalog
+from travel.like_state import get_liked_content_ids, liked_in, mark_liked, peek_like_set
+from travel.detail_index import get_detail_index
+from travel.similar_items import get_category_sampler
+from travel.target_table import group_by_table, resolve_target_table
 import requests
 from copy import deepcopy
-import json
 import ast
+from typing import List, Optional
+from pydantic import BaseModel
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -17,240 +28,259 @@ load_dotenv()
 
 router = APIRouter()
 
-MYSQL_HOSTNAME = os.getenv('MYSQL_HOSTNAME')
-MYSQL_PORT = int(os.getenv('MYSQL_PORT'))
-MYSQL_USERNAME = os.getenv('MYSQL_USERNAME')
-MYSQL_PASSWORD = os.getenv('MYSQL_PASSWORD')
-MYSQL_DATABASE = os.getenv('MYSQL_DATABASE')
+# 상세 행과 좋아요 여부를 한 번의 쿼리로 조회 (좋아요한 contentId는 스칼라 서브쿼리로 함께 받음)
+def fetch_detail_with_likes(connection, target_table, contentid, user_id, like_candidates):
+    # 사용자 좋아요 집합이 이미 캐시에 있으면 상세 행만 조회 (확인한 집합을 그대로 사용)
+    like_set = peek_like_set(user_id)
+    if like_set is not None:
+        df_detail = pd.read_sql(f"SELECT * FROM {target_table} WHERE contentid = %s", connection, params=(contentid,))
+        return df_detail, liked_in(like_set, like_candidates)
+
+    detail_query = f"""SELECT t.*,
+                              (SELECT GROUP_CONCAT(l.contentId)
+                               FROM likes l
+                               WHERE l.userId = %s AND l.contentId IN %s) AS liked_content_ids
+                       FROM {target_table} t
+                       WHERE t.contentid = %s"""
+    df_detail = pd.read_sql(detail_query, connection, params=(user_id, tuple(like_candidates), contentid))
+
+    liked_ids = set()
+    if not df_detail.empty:
+        liked_value = df_detail['liked_content_ids'].values[0]
+        if isinstance(liked_value, bytes):
+            liked_value = liked_value.decode()
+        if isinstance(liked_value, str) and liked_value:
+            liked_ids = {int(content_id) for content_id in liked_value.split(',')}
+    return df_detail.drop(columns=['liked_content_ids']), liked_ids
+
+
+# 상세 페이지 콘텐츠 부분 캐시 크기 (좋아요 상태는 캐시하지 않고 요청마다 덧씌움)
+DETAIL_CACHE_SIZE = int(os.getenv('DETAIL_CACHE_SIZE', '2048'))
+# 사용자별 좋아요 상태가 섞인 응답이므로 공유 캐시에는 두지 않고, 매번 ETag로 재검증
+DETAIL_CACHE_CONTROL = "private, no-cache"
+
+_detail_cache = LRUCache(DETAIL_CACHE_SIZE)
+
+
+def build_detail_content(target_table, contentid, df_detail, recommend_records, detail_index):
+    """
+    좋아요 상태를 뺀 상세 페이지 콘텐츠 부분. 같은 카탈로그/보조 인덱스 버전 동안 캐시해 재사용한다.
+    """
+    df_detail = df_detail.replace({'': np.nan, ' ': np.nan})
+    df_detail['cat2'] = target_table
 
+    # 보조 정보 병합 (미리 읽어 둔 인덱스 조회)
+    pet_result = None
+    if detail_index is not None:
+        # stay_main일 경우 최저 요금 (0과 NaN을 제외한 최솟값, 없으면 NaN)
+        if target_table == 'stay_main':
+            df_detail['roomoffseasonminfee1'] = detail_index.min_fee(contentid)
+        pet_result = detail_index.pet_records(contentid)
+    elif target_table == 'stay_main':
+        df_detail['roomoffseasonminfee1'] = np.nan
 
-def connect_mysql(query, params=None):
-    try:
-        connection = pymysql.connect(
-            host=MYSQL_HOSTNAME,
-            port=MYSQL_PORT,
-            user=MYSQL_USERNAME,
-            password=MYSQL_PASSWORD,
-            database=MYSQL_DATABASE
-        )
-        # 쿼리를 실행하여 데이터를 가져오기
-        df = pd.read_sql(query, connection, params=params)
-        return df
+    content = {
+        "result": df_to_records(df_detail),
+        "pet": pet_result,
+        "recommend": recommend_records,
+    }
+    content["digest"] = content_digest(content)
+    content["like_candidates"] = [contentid] + [record['contentid'] for record in recommend_records]
+    return content
 
-    except Exception as e:
-        print(f"Error: {str(e)}")
-        return pd.DataFrame()  # 오류 발생 시 빈 DataFrame 반환
 
-    finally:
-        connection.close()
+def recommend_seed(contentid, catalog):
+    # 같은 버전 동안 같은 추천이 나오도록 seed를 고정해 캐시/ETag가 안정적으로 유지되게 함
+    return f"{contentid}:{catalog.version}"
 
-def get_info_by_id(table, column, search_id):
-    query = f"SELECT * FROM {table} WHERE {column} = %s"
 
+def detail_cache_key(contentid, catalog, detail_index):
+    return contentid, catalog.version, detail_index.version if detail_index is not None else None
+
+
+def load_detail_content(connection, target_table, contentid, user_id, catalog, detail_index):
+    """
+    캐시에 없을 때 상세 콘텐츠를 만들고 좋아요 상태도 함께 반환 (상세 행 + 좋아요를 한 번의 쿼리로).
+    콘텐츠가 없으면 None을 반환한다.
+    """
+    # 추천 후보를 카드에서 미리 뽑아 좋아요 조회를 상세 쿼리에 합침 (cat3는 카드 기준)
+    sampler = get_category_sampler(catalog)
+    seed = recommend_seed(contentid, catalog)
+    category = sampler.category_of(target_table, contentid)
+    recommend_records = sampler.sample(target_table, category, contentid, seed=seed) if category is not None else []
+
+    like_candidates = [contentid] + [record['contentid'] for record in recommend_records]
+    df_detail, liked_ids = fetch_detail_with_likes(connection, target_table, contentid, user_id, like_candidates)
+    if df_detail.empty:
+        return None, liked_ids
+
+    # 카드에 없는 새 콘텐츠면 상세 행의 cat3로 추천을 뽑고 같은 연결에서 좋아요를 추가 조회
+    if category is None:
+        recommend_records = sampler.sample(target_table, df_detail['cat3'].values[0], contentid, seed=seed)
+        if recommend_records:
+            liked_ids |= get_liked_content_ids(
+                user_id, [record['contentid'] for record in recommend_records], connection)
+
+    content = build_detail_content(target_table, contentid, df_detail, recommend_records, detail_index)
+    _detail_cache.put(detail_cache_key(contentid, catalog, detail_index), content)
+    return content, liked_ids
+
+
+def render_detail(contentid, content, liked_ids):
+    # 캐시된 콘텐츠에 사용자별 좋아요 상태를 덧씌운 응답 본문과 ETag
+    recommend_records = content["recommend"]
+    if recommend_records:
+        recommend_result = {"result": mark_liked([recommend_records], liked_ids)[0]}
+    else:
+        recommend_result = {"result": None}
+
+    json_output = {
+        "result": content["result"],
+        "pet": content["pet"],
+        "is_liked": contentid in liked_ids,
+        "recommend": recommend_result
+    }
+    like_bits = ''.join('1' if content_id in liked_ids else '0' for content_id in content["like_candidates"])
+    etag = f'"{content["digest"]}-{like_bits}"'
+    return json_output, etag
+
+
+def _read_main_items(contentid: int, user_id: int, catalog, detail_index, if_none_match=None):
     try:
-        connection = pymysql.connect(
-            host=MYSQL_HOSTNAME,
-            port=MYSQL_PORT,
-            user=MYSQL_USERNAME,
-            password=MYSQL_PASSWORD,
-            database=MYSQL_DATABASE
-        )
-        # 쿼리 실행하여 해당 ID가 있는지 확인
-        with connection.cursor() as cursor:
-            cursor.execute(f"SELECT EXISTS(SELECT 1 FROM {table} WHERE {column} = %s)", (search_id,))
-            exists = cursor.fetchone()[0]
-
-            if exists:
-                # 해당 ID가 있을 경우 데이터를 조회
-                df = pd.read_sql(query, connection, params=(search_id,))
-                return df
-            else:
-                return None
-    except Exception as e:
-        print(f"Error: {e}")
-        return None
+        # 1. 대상 테이블 이름 가져오기 (메모리 매핑 조회)
+        target_table = resolve_target_table(contentid)
 
+        if target_table is None:
+            raise HTTPException(status_code=404, detail="Content not found")
 
+        # 2. 콘텐츠 부분은 캐시에서, 좋아요 상태는 항상 새로 조회
+        content = _detail_cache.get(detail_cache_key(contentid, catalog, detail_index))
+        if content is not None:
+            liked_ids = get_liked_content_ids(user_id, content["like_candidates"])
+        else:
+            with get_connection() as connection:
+                content, liked_ids = load_detail_content(
+                    connection, target_table, contentid, user_id, catalog, detail_index)
 
-def get_random_rows(target_table, category, contentid, user_id):
-    recomm_query = f"""
-    SELECT contentid, title, cat3, address, firstimage
-    FROM {target_table}
-    WHERE cat3 = %s
-    AND contentid != %s
-    ORDER BY RAND()
-    LIMIT 5;
-    """
+            if content is None:
+                raise HTTPException(status_code=404, detail="Content details not found")
 
-    try:
-        # MySQL에 직접 연결
-        connection = pymysql.connect(
-            host=MYSQL_HOSTNAME,
-            port=MYSQL_PORT,
-            user=MYSQL_USERNAME,
-            password=MYSQL_PASSWORD,
-            database=MYSQL_DATABASE
-        )
-
-        try:
-            # 쿼리를 실행하고 DataFrame으로 반환
-            df = pd.read_sql(recomm_query, connection, params=(category, contentid))
-
-            # JSON 응답 생성
-            if df.empty:
-                # 결과가 없으면 None 반환
-                json_output = {"result": None}
-            else:
-                content_ids = df['contentid'].tolist()
-
-                # 좋아요 상태를 가져오는 쿼리
-                like_query = """
-                                   SELECT contentId
-                                   FROM likes
-                                   WHERE userId = %s AND contentId IN %s
-                               """
-
-                # IN 연산자를 사용하기 위해 튜플 형태로 변환
-                content_ids_tuple = tuple(content_ids)
-                if len(content_ids_tuple) == 1:
-                    content_ids_tuple += (None,)  # 단일 요소 튜플일 경우 콤마 추가
-
-                # 좋아요 상태를 가져옴
-                df_likes = pd.read_sql(like_query, connection, params=(user_id, content_ids_tuple))
-
-                # 좋아요 상태를 표시하기 위한 컬럼 추가
-                df['is_liked'] = df['contentid'].isin(df_likes['contentId'])
-
-                json_output = {
-                    "result": json.loads(df.to_json(orient='records', force_ascii=False))
-                }
-
-            return json_output
-
-        except Exception as e:
-            print(f"Error executing query: {str(e)}")
-            return {"result": None}
-
-        finally:
-            # MySQL 연결 해제
-            connection.close()
+        # 3. 응답 생성 (클라이언트가 가진 것과 같으면 본문 없이 304)
+        json_output, etag = render_detail(contentid, content, liked_ids)
+        headers = {"ETag": etag, "Cache-Control": DETAIL_CACHE_CONTROL}
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+
+        return JSONResponse(content=json_output, headers=headers)
 
+    except HTTPException as he:
+        raise he
+    except pymysql.MySQLError as err:
+        print(f"Database Error: {err}")
+        raise HTTPException(status_code=500, detail="Database Error")
     except Exception as e:
-        print(f"Error connecting to MySQL: {str(e)}")
-        return {"result": None}
+        raise HTTPException(status_code=500, detail=f"Error occurred: {str(e)}")
+
+
+async def _load_detail_index():
+    # 보조 인덱스를 읽지 못해도 상세 정보는 내려주도록 (기존처럼 펫/요금 정보만 빠짐)
+    try:
+        return await run_db(get_detail_index)
+    except Exception as e:
+        print(f"Error loading detail index: {str(e)}")
+        return None
+
 
 @router.get("/details/{contentid}")
-async def read_main_items(contentid: int, user_id: int):
+async def read_main_items(contentid: int, user_id: int, if_none_match: Optional[str] = Header(None)):
     """
     contentid와 user_id를 인자로 받아 DB에서 정보를 조회한 후 JSON 응답으로 반환
     """
-    try:
-        # 1. 대상 테이블 이름 가져오기
-        query = """SELECT target_table 
-                       FROM main_total_v2 
-                       WHERE contentsid = %s"""
-        df_target_table = connect_mysql(query, params=(contentid,))
+    # 카탈로그와 보조 인덱스는 서로 독립적이므로 동시에 준비 (워밍 이후에는 메모리 조회)
+    catalog, detail_index = await asyncio.gather(run_db(get_catalog), _load_detail_index())
+    return await run_db(_read_main_items, contentid, user_id, catalog, detail_index, if_none_match)
 
-        if df_target_table.empty:
-            raise HTTPException(status_code=404, detail="Content not found")
 
-        target_table = df_target_table['target_table'].values[0]
+# 한 번에 요청할 수 있는 최대 contentid 수
+DETAIL_BATCH_MAX = int(os.getenv('DETAIL_BATCH_MAX', '50'))
 
-        # 2. 세부 정보 가져오기
-        detail_info_query = f"""SELECT * 
-                                    FROM {target_table}
-                                    WHERE contentid = %s"""
-        df_detail = connect_mysql(detail_info_query, params=(contentid,))
 
-        if df_detail.empty:
-            raise HTTPException(status_code=404, detail="Content details not found")
+class DetailBatchRequest(BaseModel):
+    userId: int
+    contentIds: List[int]
 
-        df_detail = df_detail.replace({'': np.nan, ' ': np.nan})
-        df_detail['cat2'] = target_table
 
-        # stay_main일 경우 추가 정보 가져오기
-        if target_table == 'stay_main':
-            stay_info_query = """
-                    SELECT roomoffseasonminfee1
-                    FROM stay_info
-                    WHERE contentid = %s
-                    """
-            df_stay_info = connect_mysql(stay_info_query, params=(contentid,))
-
-            if not df_stay_info.empty:
-                # roomoffseasonminfee1 컬럼을 숫자형으로 변환
-                df_stay_info['roomoffseasonminfee1'] = pd.to_numeric(
-                    df_stay_info['roomoffseasonminfee1'], errors='coerce'
-                )
-
-                # 0과 NaN 값을 제외한 값들로 필터링
-                fees_nonzero = df_stay_info['roomoffseasonminfee1'][
-                    (df_stay_info['roomoffseasonminfee1'] != 0) & (~df_stay_info['roomoffseasonminfee1'].isna())
-                    ]
-
-                if not fees_nonzero.empty:
-                    # 최소값 구하기
-                    min_fee = fees_nonzero.min()
-                    df_detail['roomoffseasonminfee1'] = min_fee
-                else:
-                    # 모든 값이 0 또는 NaN인 경우
-                    df_detail['roomoffseasonminfee1'] = np.nan
-            else:
-                df_detail['roomoffseasonminfee1'] = np.nan
-
-
-        # 3. 펫 정보 확인 및 병합
-        table_name = 'pet_total'
-        column_name = 'contentid'
-
-        df_pet_target_table = get_info_by_id(table_name, column_name, contentid)
-
-        # df_pet 변수 초기화
-        df_pet = None
-
-        if df_pet_target_table is not None and not df_pet_target_table.empty:
-            pet_target_table = df_pet_target_table['target_table'].values[0]
-
-            get_pet_info = f"""SELECT * 
-                                   FROM {pet_target_table} 
-                                   WHERE contentid = %s"""
-            df_pet = connect_mysql(get_pet_info, params=(contentid,))
-
-            df_pet = df_pet.replace({'': np.nan, ' ': np.nan})
-
-            # df_detail = df_detail.merge(df_pet, on='contentid', how='left')
-
-        # 4. 좋아요 상태 확인
-        like_check_query = """
-                SELECT EXISTS(
-                    SELECT 1 FROM likes
-                    WHERE userId = %s AND contentId = %s
-                ) AS is_liked
-                """
-        df_like = connect_mysql(like_check_query, params=(user_id, contentid))
-
-        is_liked = bool(df_like['is_liked'].values[0])
-
-        # 5. 추천 정보 가져오기
-        category = df_detail['cat3'].values[0]
-        recommend_result = get_random_rows(target_table, category, contentid, user_id)
-
-        # 6. 응답 생성
-        if df_pet is not None and not df_pet.empty:
-            pet_result = json.loads(df_pet.to_json(orient='records', force_ascii=False))
-        else:
-            pet_result = None
+def _read_details_batch(request: DetailBatchRequest, catalog, detail_index):
+    try:
+        # 중복 제거 (요청 순서 유지)
+        content_ids = list(dict.fromkeys(request.contentIds))
+
+        with get_connection() as connection:
+            # 1. 테이블별로 묶기 (메모리 매핑 조회, 없는/허용되지 않은 contentid는 제외)
+            groups = group_by_table(content_ids, connection)
+            target_tables = {content_id: table for table, ids in groups.items() for content_id in ids}
+
+            # 2. 캐시에 없는 콘텐츠만 테이블당 한 번의 IN 쿼리로 조회
+            contents = {}
+            sampler = get_category_sampler(catalog)
+            for table, ids in groups.items():
+                missing_ids = []
+                for content_id in ids:
+                    content = _detail_cache.get(detail_cache_key(content_id, catalog, detail_index))
+                    if content is not None:
+                        contents[content_id] = content
+                    else:
+                        missing_ids.append(content_id)
+                if not missing_ids:
+                    continue
+
+                detail_query = f"""SELECT *
+                                   FROM {table}
+                                   WHERE contentid IN %s"""
+                df_details = pd.read_sql(detail_query, connection, params=(tuple(missing_ids),))
+                for content_id, df_detail in df_details.groupby('contentid', sort=False):
+                    content_id = int(content_id)
+                    if content_id not in target_tables:
+                        continue
+                    df_detail = df_detail.reset_index(drop=True)
+                    recommend_records = sampler.sample(table, df_detail['cat3'].values[0], content_id,
+                                                       seed=recommend_seed(content_id, catalog))
+                    content = build_detail_content(table, content_id, df_detail, recommend_records, detail_index)
+                    _detail_cache.put(detail_cache_key(content_id, catalog, detail_index), content)
+                    contents[content_id] = content
+
+            # 3. 모든 콘텐츠와 추천 항목의 좋아요 상태를 한 번에 조회
+            like_candidates = [content_id for content in contents.values() for content_id in content["like_candidates"]]
+            liked_ids = get_liked_content_ids(request.userId, like_candidates, connection)
+
+        # 4. 요청 순서대로 응답 생성
+        result = []
+        for content_id in content_ids:
+            content = contents.get(content_id)
+            if content is None:
+                continue
+            json_output, _ = render_detail(content_id, content, liked_ids)
+            result.append(dict(contentid=content_id, **json_output))
+
+        missing = [content_id for content_id in content_ids if content_id not in contents]
+        return JSONResponse(content={"result": result, "missing": missing})
+
+    except pymysql.MySQLError as err:
+        print(f"Database Error: {err}")
+        raise HTTPException(status_code=500, detail="Database Error")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error occurred: {str(e)}")
 
-        json_output = {
-            "result": json.loads(df_detail.to_json(orient='records', force_ascii=False)),
-            "pet": pet_result,
-            "is_liked": is_liked,
-            "recommend": recommend_result
-        }
 
-        return JSONResponse(content=json_output)
+@router.post("/details/batch")
+async def read_details_batch(request: DetailBatchRequest):
+    """
+    여러 contentid의 상세 정보, 반려동물 정보, 좋아요 상태를 한 번에 반환 (최대 DETAIL_BATCH_MAX개)
+    """
+    if len(request.contentIds) > DETAIL_BATCH_MAX:
+        raise HTTPException(status_code=400, detail=f"Too many contentIds (max {DETAIL_BATCH_MAX})")
+    if not request.contentIds:
+        return JSONResponse(content={"result": [], "missing": []})
 
-    except HTTPException as he:
-        raise he
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error occurred: {str(e)}")
\ No newline at end of file
+    catalog, detail_index = await asyncio.gather(run_db(get_catalog), _load_detail_index())
+    return await run_db(_read_details_batch, request, catalog, detail_index)
@@ -0,0 +1,165 @@
+import os
+import threading
+import time
+
+import pandas as pd
+from dotenv import load_dotenv
+
+from common.responses import df_to_records
+from Database.pool import get_connection
+from Database.snapshot import RefreshingSnapshot
+from travel.target_table import ALLOWED_TABLES, group_by_table
+
+load_dotenv()
+
+# 카탈로그 스냅샷 갱신 주기(초)
+CATALOG_TTL = int(os.getenv('CATALOG_TTL', '600'))
+
+# 메인 페이지 구성에 쓰이는 테이블별 조회 쿼리
+CATALOG_QUERIES = {
+    'fix': """SELECT *
+                FROM visit_main_fix
+                WHERE firstimage is not null
+                AND firstimage not in ('', ' ', 'None')
+                AND contentid is not null
+                AND tag is not null""",
+    'festival': """select * from festival_main
+            where cat2='축제'
+            and firstimage is not null
+            and firstimage not in ('',' ', 'None')
+            and contentid is not null
+            and eventstartdate > CURDATE()""",
+    'restaurant': """select * from food_main
+            where cat3 not in ('카페/전통찻집')
+            and firstimage is not null
+            and firstimage not in ('',' ', 'None')
+            and contentid is not null""",
+    'cafe': """select * from food_main
+            where cat3 = '카페/전통찻집'
+            and firstimage is not null
+            and firstimage not in ('',' ', 'None')
+            and contentid is not null""",
+    'hotel': """select * from stay_main
+            where cat3 in ('관광호텔', '콘도미니엄')
+            and firstimage is not null
+            and firstimage not in ('',' ', 'None')
+            and contentid is not null""",
+}
+
+# 추천/지도/코스 이미지 등에 쓰이는 테이블별 콘텐츠 요약(카드) 조회 쿼리
+CARD_COLUMNS = ['contentid', 'title', 'cat2', 'cat3', 'address', 'firstimage', 'mapx', 'mapy']
+CARD_QUERY = "SELECT {columns} FROM {table} WHERE contentid is not null"
+
+
+class Catalog:
+    """
+    한 시점의 카탈로그 테이블 묶음. 여러 요청이 동시에 읽으므로 DataFrame은 절대 제자리에서 수정하지 않는다.
+    """
+
+    def __init__(self, version, frames, cards):
+        self.version = version
+        self.loaded_at = time.time()
+        self.df_fix = frames['fix']
+        self.df_festival = frames['festival']
+        self.df_restaurant = frames['restaurant']
+        self.df_cafe = frames['cafe']
+        self.df_hotel = frames['hotel']
+        # 허용된 테이블별 카드 DataFrame (CARD_COLUMNS)
+        self.cards = cards
+        self._derived = {}
+        self._derived_lock = threading.Lock()
+
+    def derived(self, name, builder):
+        # 스냅샷에서 파생되는 인덱스(태그 인덱스 등)를 스냅샷당 한 번만 만들어 함께 교체되도록 보관
+        value = self._derived.get(name)
+        if value is None:
+            with self._derived_lock:
+                value = self._derived.get(name)
+                if value is None:
+                    value = builder(self)
+                    self._derived[name] = value
+        return value
+
+    def peek_derived(self, name):
+        # 이미 만들어진 파생 인덱스만 반환 (없으면 None)
+        return self._derived.get(name)
+
+
+def load_catalog(version):
+    frames = {}
+    with get_connection() as connection:
+        for name, query in CATALOG_QUERIES.items():
+            frames[name] = pd.read_sql(query, connection)
+        cards = {}
+        for table in ALLOWED_TABLES:
+            query = CARD_QUERY.format(columns=', '.join(CARD_COLUMNS), table=table)
+            cards[table] = pd.read_sql(query, connection)
+    return Catalog(version, frames, cards)
+
+
+_catalog_snapshot = RefreshingSnapshot('catalog', load_catalog, CATALOG_TTL)
+
+
+def get_catalog():
+    return _catalog_snapshot.get()
+
+
+def get_catalog_nowait():
+    # 아직 로드 전이면 None (백그라운드에서 로드 시작)
+    return _catalog_snapshot.get_nowait()
+
+
+def peek_catalog():
+    return _catalog_snapshot.peek()
+
+
+def build_card_lookup(catalog):
+    # contentid → 카드 레코드 (여러 테이블에 같은 contentid가 있으면 먼저 나온 테이블 기준)
+    lookup = {}
+    for table, df in catalog.cards.items():
+        for record in df_to_records(df):
+            lookup.setdefault(record['contentid'], dict(record, target_table=table))
+    return lookup
+
+
+def get_card_lookup(catalog):
+    return catalog.derived('card_lookup', build_card_lookup)
+
+
+def lookup_card_fields(cursor, connection, content_ids, columns):
+    """
+    contentid → {column: 값} (columns는 CARD_COLUMNS 중에서). 카탈로그 카드에서 먼저 찾고
+    없는 것만 테이블별 IN 쿼리로 조회한다. cursor는 DictCursor여야 한다.
+    """
+    columns = [column for column in columns if column != 'contentid']
+    unknown = set(columns).difference(CARD_COLUMNS)
+    if unknown:
+        raise ValueError(f"Not a card column: {sorted(unknown)}")
+
+    found = {}
+    try:
+        # 카탈로그가 아직 로드 전이면 기다리지 않고 전부 DB에서 조회 (이미 연결을 대여한 상태이므로)
+        catalog = get_catalog_nowait()
+        cards = get_card_lookup(catalog) if catalog is not None else {}
+    except Exception as e:
+        # 카탈로그를 읽지 못하면 전부 DB에서 조회
+        print(f"Error loading catalog: {str(e)}")
+        cards = {}
+    missing = []
+    for content_id in content_ids:
+        card = cards.get(content_id)
+        if card is not None:
+            found[content_id] = {column: card[column] for column in columns}
+        else:
+            missing.append(content_id)
+
+    for target_table, ids in group_by_table(missing, connection).items():
+        field_query = f"""
+        SELECT contentid, {', '.join(columns)}
+        FROM {target_table}
+        WHERE contentid IN %s
+        """
+        cursor.execute(field_query, (tuple(ids),))
+        for row in cursor.fetchall():
+            found.setdefault(row['contentid'], {column: row[column] for column in columns})
+    return found
@@ -0,0 +1,71 @@
+import os
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+
+from common.responses import df_to_records
+from Database.pool import get_connection
+from Database.snapshot import RefreshingSnapshot
+
+load_dotenv()
+
+# 상세 페이지 보조 정보(숙박 최저 요금, 반려동물 정보) 갱신 주기(초)
+DETAIL_INDEX_TTL = int(os.getenv('DETAIL_INDEX_TTL', os.getenv('CATALOG_TTL', '600')))
+
+
+class DetailIndex:
+    """
+    상세 페이지에 붙는 보조 정보 인덱스.
+
+    - min_fees : contentid → stay_info.roomoffseasonminfee1 중 0/NaN을 제외한 최솟값
+    - pets     : contentid → pet_total이 가리키는 반려동물 테이블의 레코드 목록
+    """
+
+    def __init__(self, version, min_fees, pets):
+        self.version = version
+        self.min_fees = min_fees
+        self.pets = pets
+
+    def min_fee(self, contentid):
+        # 요금 정보가 없으면 NaN (기존 응답과 동일하게 null로 직렬화됨)
+        return self.min_fees.get(contentid, np.nan)
+
+    def pet_records(self, contentid):
+        return self.pets.get(contentid)
+
+
+def _load_min_fees(connection):
+    df = pd.read_sql("SELECT contentid, roomoffseasonminfee1 FROM stay_info", connection)
+    fees = pd.to_numeric(df['roomoffseasonminfee1'], errors='coerce')
+    # 0과 NaN 값을 제외한 값들 중 최솟값
+    df = df.assign(roomoffseasonminfee1=fees)[(fees != 0) & fees.notna()]
+    return {int(contentid): float(fee) for contentid, fee in df.groupby('contentid')['roomoffseasonminfee1'].min().items()}
+
+
+def _load_pets(connection):
+    df_pet_total = pd.read_sql("SELECT contentid, target_table FROM pet_total", connection)
+    df_pet_total = df_pet_total.dropna().drop_duplicates('contentid')
+
+    pets = {}
+    for pet_table, df_targets in df_pet_total.groupby('target_table'):
+        targets = set(df_targets['contentid'].astype(int))
+        df_pet = pd.read_sql(f"SELECT * FROM {pet_table}", connection)
+        df_pet = df_pet[df_pet['contentid'].isin(targets)].replace({'': np.nan, ' ': np.nan})
+        for record in df_to_records(df_pet):
+            pets.setdefault(int(record['contentid']), []).append(record)
+    return pets
+
+
+def load_detail_index(version):
+    with get_connection() as connection:
+        min_fees = _load_min_fees(connection)
+        pets = _load_pets(connection)
+    return DetailIndex(version, min_fees, pets)
+
+
+_detail_index_snapshot = RefreshingSnapshot('detail_index', load_detail_index, DETAIL_INDEX_TTL)
+
+
+def get_detail_index():
+    return _detail_index_snapshot.get()
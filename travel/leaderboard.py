@@ -0,0 +1,88 @@
+import random
+import threading
+
+from common.responses import df_to_records
+from travel.catalog import peek_catalog
+
+# 테마별로 미리 정렬해 두는 상위 항목 수 (메인 페이지에는 이 중 5개만 노출)
+LEADERBOARD_SIZE = 50
+LEADERBOARD_COLUMNS = ['contentid', 'title', 'cat2', 'cat3', 'firstimage', 'address', 'mapx', 'mapy']
+
+SEA_CAT3 = ['해수욕장', '섬', '해안절경', '등대', '항구/포구']
+
+
+class ThemeLeaderboard:
+    """
+    한 테마의 like_count 상위 목록. 카탈로그 스냅샷이 만들어질 때 한 번 정렬하고,
+    이후 좋아요/취소는 apply_delta로 상위 목록만 갱신한다.
+    """
+
+    def __init__(self, topic, df):
+        self.topic = topic
+        records = df_to_records(df[LEADERBOARD_COLUMNS])
+        like_counts = df['like_count'].fillna(0).astype(int).tolist()
+
+        self.rows = {}
+        self.like_counts = {}
+        for record, like_count in zip(records, like_counts):
+            self.rows[record['contentid']] = dict({'type': topic}, **record)
+            self.like_counts[record['contentid']] = like_count
+        self.nonzero = sum(1 for like_count in self.like_counts.values() if like_count != 0)
+
+        ranked = sorted(self.like_counts, key=self.like_counts.get, reverse=True)
+        self.top = ranked[:LEADERBOARD_SIZE]
+        self._lock = threading.Lock()
+
+    def apply_delta(self, content_id, delta):
+        with self._lock:
+            before = self.like_counts.get(content_id)
+            if before is None:
+                return
+            after = max(before + delta, 0)
+            self.like_counts[content_id] = after
+            self.nonzero += (after != 0) - (before != 0)
+
+            # 상위 목록 밖 항목과의 경계는 다음 스냅샷 재빌드 때 DB 값으로 다시 맞춰짐
+            if content_id in self.top:
+                self.top.sort(key=self.like_counts.get, reverse=True)
+            elif len(self.top) < LEADERBOARD_SIZE or after > self.like_counts[self.top[-1]]:
+                self.top.append(content_id)
+                self.top.sort(key=self.like_counts.get, reverse=True)
+                del self.top[LEADERBOARD_SIZE:]
+
+    def top_records(self, n=5):
+        with self._lock:
+            if self.nonzero == 0:
+                # 좋아요가 하나도 없으면 무작위로 노출
+                return random.sample(list(self.rows.values()), min(len(self.rows), n))
+            return [self.rows[content_id] for content_id in self.top[:n]]
+
+
+# 메인 페이지 view3 테마 순서: 바다, 축제, 카페, 맛집, 힐링, 호캉스
+def build_leaderboards(catalog):
+    df_fix = catalog.df_fix
+    return [
+        ThemeLeaderboard('바다', df_fix[df_fix['cat3'].isin(SEA_CAT3)]),
+        ThemeLeaderboard('축제', catalog.df_festival),
+        ThemeLeaderboard('카페', catalog.df_cafe),
+        ThemeLeaderboard('맛집', catalog.df_restaurant),
+        ThemeLeaderboard('힐링', df_fix[df_fix['tag'].apply(lambda x: '힐링' in x)]),
+        ThemeLeaderboard('호캉스', catalog.df_hotel),
+    ]
+
+
+def get_famous_spots(catalog, n=5):
+    leaderboards = catalog.derived('leaderboards', build_leaderboards)
+    return [record for leaderboard in leaderboards for record in leaderboard.top_records(n)]
+
+
+# 좋아요 수 변경을 현재 스냅샷의 리더보드에 반영 (아직 만들어지지 않았으면 다음 빌드 때 DB 값을 사용)
+def apply_like_delta(content_id, delta):
+    catalog = peek_catalog()
+    if catalog is None:
+        return
+    leaderboards = catalog.peek_derived('leaderboards')
+    if leaderboards is None:
+        return
+    for leaderboard in leaderboards:
+        leaderboard.apply_delta(content_id, delta)
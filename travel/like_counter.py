@@ -0,0 +1,100 @@
+import os
+import threading
+from collections import defaultdict
+
+from dotenv import load_dotenv
+
+from Database.pool import get_connection
+from travel.target_table import group_by_table
+
+load_dotenv()
+
+# 좋아요 수 변경분을 모아서 반영하는 주기(초)
+LIKE_FLUSH_INTERVAL = float(os.getenv('LIKE_FLUSH_INTERVAL', '2'))
+
+_pending = defaultdict(int)
+_pending_lock = threading.Lock()
+# 한 번에 하나의 flush만 DB에 쓰도록 (주기 flush와 종료 시 flush가 겹치지 않게)
+_flush_lock = threading.Lock()
+
+_flusher = None
+_flusher_lock = threading.Lock()
+_stop = threading.Event()
+
+
+def record_like_delta(content_id, delta):
+    """
+    like_count 변경분을 메모리에 누적 (실제 UPDATE는 백그라운드에서 테이블별로 묶어서 실행)
+    """
+    with _pending_lock:
+        _pending[int(content_id)] += delta
+    _ensure_flusher()
+
+
+def flush_like_counts():
+    """
+    누적된 변경분을 테이블당 한 번의 UPDATE로 반영. 실패하면 변경분을 다시 누적해 다음 주기에 재시도한다.
+    """
+    global _pending
+    with _flush_lock:
+        with _pending_lock:
+            if not _pending:
+                return 0
+            deltas, _pending = _pending, defaultdict(int)
+
+        deltas = {content_id: delta for content_id, delta in deltas.items() if delta != 0}
+        if not deltas:
+            return 0
+
+        try:
+            with get_connection(autocommit=True) as connection:
+                groups = group_by_table(list(deltas), connection)
+                with connection.cursor() as cursor:
+                    for table, content_ids in groups.items():
+                        # contentid별 변경분을 CASE로 한 번에 반영
+                        cases = ' '.join(['WHEN %s THEN %s'] * len(content_ids))
+                        update_query = f"""
+                        UPDATE {table}
+                        SET like_count = like_count + CASE contentid {cases} ELSE 0 END
+                        WHERE contentid IN %s
+                        """
+                        params = [value for content_id in content_ids for value in (content_id, deltas[content_id])]
+                        params.append(tuple(content_ids))
+                        cursor.execute(update_query, params)
+                        # 반영된 테이블의 변경분은 재시도 대상에서 제외
+                        for content_id in content_ids:
+                            deltas.pop(content_id)
+            # 대상 테이블을 찾을 수 없는 contentid는 기존처럼 반영하지 않음
+            return len(groups)
+        except Exception as e:
+            print(f"Error flushing like counts: {str(e)}")
+            with _pending_lock:
+                for content_id, delta in deltas.items():
+                    _pending[content_id] += delta
+            return 0
+
+
+def _run_flusher():
+    while not _stop.wait(LIKE_FLUSH_INTERVAL):
+        flush_like_counts()
+
+
+def _ensure_flusher():
+    global _flusher
+    if _flusher is not None or _stop.is_set():
+        return
+    with _flusher_lock:
+        if _flusher is None and not _stop.is_set():
+            _flusher = threading.Thread(target=_run_flusher, name='like-counter-flush', daemon=True)
+            _flusher.start()
+
+
+def stop_like_counter():
+    # 종료 시 주기 flush를 멈추고 남은 변경분을 마지막으로 반영
+    global _flusher
+    _stop.set()
+    with _flusher_lock:
+        if _flusher is not None:
+            _flusher.join()
+            _flusher = None
+    flush_like_counts()
@@ -0,0 +1,118 @@
+import os
+import threading
+
+import numpy as np
+from dotenv import load_dotenv
+
+from common.lru import LRUCache
+from Database.pool import get_connection
+
+load_dotenv()
+
+# 좋아요 집합을 캐시할 최대 사용자 수와 항목 유지 시간(초)
+# (다른 워커 프로세스에서 일어난 좋아요 변경은 이 시간 안에 반영됨)
+LIKE_CACHE_USERS = int(os.getenv('LIKE_CACHE_USERS', '10000'))
+LIKE_CACHE_TTL = float(os.getenv('LIKE_CACHE_TTL', '60'))
+
+# userId → 좋아요한 contentId 정렬 배열 (int64)
+_like_sets = LRUCache(LIKE_CACHE_USERS, ttl=LIKE_CACHE_TTL)
+
+# DB에서 읽는 중인 사용자 → [동시에 읽는 요청 수, 그 사이 쓰기 발생 여부]
+_loading = {}
+_write_lock = threading.Lock()
+
+
+def _load_like_set(user_id, connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT contentId FROM likes WHERE userId = %s", (user_id,))
+        rows = cursor.fetchall()
+    content_ids = [row['contentId'] if isinstance(row, dict) else row[0] for row in rows]
+    return np.unique(np.asarray(content_ids, dtype=np.int64))
+
+
+def get_like_set(user_id, connection=None):
+    """
+    사용자가 좋아요한 전체 contentId 정렬 배열. 처음 한 번만 DB에서 읽고 이후에는 캐시에서 반환한다.
+    """
+    like_set = _like_sets.get(user_id)
+    if like_set is not None:
+        return like_set
+
+    with _write_lock:
+        loading = _loading.setdefault(user_id, [0, False])
+        loading[0] += 1
+    like_set = None
+    try:
+        if connection is None:
+            with get_connection() as connection:
+                like_set = _load_like_set(user_id, connection)
+        else:
+            like_set = _load_like_set(user_id, connection)
+    finally:
+        with _write_lock:
+            # 읽는 동안 좋아요/취소가 있었다면 이번 결과는 캐시하지 않음 (다음 조회에서 다시 읽음)
+            if like_set is not None and not loading[1]:
+                _like_sets.put(user_id, like_set)
+            loading[0] -= 1
+            if loading[0] == 0:
+                _loading.pop(user_id, None)
+    return like_set
+
+
+def peek_like_set(user_id):
+    # 캐시에 있는 좋아요 집합 (없으면 None, DB 조회나 캐시 통계/순서 변경을 유발하지 않음)
+    return _like_sets.peek(user_id)
+
+
+# 주어진 contentId 중 사용자가 좋아요한 것만 반환 (사용자별 좋아요 집합 캐시 사용)
+def get_liked_content_ids(user_id, content_ids, connection=None):
+    content_ids = {int(content_id) for content_id in content_ids if content_id is not None}
+    if not content_ids:
+        return set()
+    return liked_in(get_like_set(user_id, connection), content_ids)
+
+
+def liked_in(like_set, content_ids):
+    # 이미 가져온 좋아요 집합에서 content_ids 중 좋아요한 것만 골라냄
+    content_ids = {int(content_id) for content_id in content_ids if content_id is not None}
+    if not content_ids or len(like_set) == 0:
+        return set()
+
+    keys = np.fromiter(content_ids, dtype=np.int64, count=len(content_ids))
+    positions = np.minimum(np.searchsorted(like_set, keys), len(like_set) - 1)
+    return set(keys[like_set[positions] == keys].tolist())
+
+
+def _update_like_set(user_id, content_id, liked):
+    with _write_lock:
+        if user_id in _loading:
+            _loading[user_id][1] = True
+        like_set = _like_sets.peek(user_id)
+        if like_set is None:
+            return
+        position = int(np.searchsorted(like_set, content_id))
+        exists = position < len(like_set) and like_set[position] == content_id
+        # 캐시된 배열은 다른 요청이 읽고 있을 수 있으므로 새 배열로 교체
+        # (저장 시각은 유지 → 다른 워커에서의 변경도 처음 읽은 때로부터 LIKE_CACHE_TTL 안에 반영됨)
+        if liked and not exists:
+            _like_sets.replace(user_id, np.insert(like_set, position, content_id))
+        elif not liked and exists:
+            _like_sets.replace(user_id, np.delete(like_set, position))
+
+
+def add_like(user_id, content_id):
+    # 좋아요 저장 후 호출 (write-through)
+    _update_like_set(user_id, int(content_id), True)
+
+
+def remove_like(user_id, content_id):
+    # 좋아요 삭제 후 호출 (write-through)
+    _update_like_set(user_id, int(content_id), False)
+
+
+# 여러 섹션의 레코드 목록에 is_liked 필드를 붙인 사본을 반환 (캐시된 레코드는 건드리지 않음)
+def mark_liked(record_lists, liked_ids, key='contentid'):
+    return [
+        [dict(record, is_liked=record.get(key) in liked_ids) for record in records]
+        for records in record_lists
+    ]
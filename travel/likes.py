@@ -1,8 +1,15 @@
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, APIRouter
 from pydantic import BaseModel
+from typing import List
 import os
 import pymysql
+from Database.pool import get_connection
+from Database.executor import run_db
+from travel.leaderboard import apply_like_delta
+from travel.like_counter import record_like_delta
+from travel.like_state import add_like, get_liked_content_ids, remove_like
+from travel.target_table import ALLOWED_TABLES, resolve_target_table
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -10,14 +17,6 @@ load_dotenv()
 
 router = APIRouter()
 
-# MySQL 연결 정보
-MYSQL_HOSTNAME = os.getenv('MYSQL_HOSTNAME')
-MYSQL_PORT = int(os.getenv('MYSQL_PORT'))
-MYSQL_USERNAME = os.getenv('MYSQL_USERNAME')
-MYSQL_PASSWORD = os.getenv('MYSQL_PASSWORD')
-MYSQL_DATABASE = os.getenv('MYSQL_DATABASE')
-
-
 # Pydantic 모델 정의
 class LikeRequest(BaseModel):
     userId: int
@@ -26,66 +25,55 @@ class LikeRequest(BaseModel):
 
 # 데이터베이스 연결 함수
 def get_db_connection():
-    connection = pymysql.connect(
-        host=MYSQL_HOSTNAME,
-        port=MYSQL_PORT,
-        user=MYSQL_USERNAME,
-        password=MYSQL_PASSWORD,
-        database=MYSQL_DATABASE,
+    connection = get_connection(
         cursorclass=pymysql.cursors.DictCursor,
         autocommit=True
     )
     return connection
 
 
+# 대상 테이블 검증 (좋아요 행을 건드리기 전에 확인)
+def validate_like_target(content_id, connection):
+    # 대상 테이블 이름 가져오기 (메모리 매핑 조회)
+    target_table = resolve_target_table(content_id, connection)
+    if target_table is None:
+        raise HTTPException(status_code=400, detail="Content ID not found")
+
+    # 허용된 테이블 이름인지 검증
+    if target_table not in ALLOWED_TABLES:
+        raise HTTPException(status_code=400, detail="Invalid target table")
+    return target_table
+
+
 # 좋아요 생성 엔드포인트
-@router.post("/like")
-async def like_destination(like: LikeRequest):
+def _like_destination(like: LikeRequest):
     connection = get_db_connection()
     try:
+        validate_like_target(like.contentId, connection)
+
         with connection.cursor() as cursor:
-            # 중복 좋아요 체크
-            check_query = """
-            SELECT COUNT(*) as count FROM likes
-            WHERE userId = %s AND contentId = %s
+            # 좋아요 삽입 (likes의 (userId, contentId) 유니크 키로 중복은 무시 → 영향받은 행 수로 판단)
+            insert_query = """
+            INSERT IGNORE INTO likes (userId, contentId)
+            VALUES (%s, %s)
             """
-            cursor.execute(check_query, (like.userId, like.contentId))
-            result = cursor.fetchone()
+            inserted = cursor.execute(insert_query, (like.userId, like.contentId))
 
-            if result['count'] > 0:
+            if inserted == 0:
                 raise HTTPException(status_code=400, detail="Already liked")
 
-            # 좋아요 삽입
-            insert_query = """
-            INSERT INTO likes (userId, contentId)
-            VALUES (%s, %s)
-            """
-            cursor.execute(insert_query, (like.userId, like.contentId))
-
-            # 대상 테이블 이름 가져오기
-            cursor.execute("SELECT target_table FROM main_total_v2 WHERE contentsid = %s", (like.contentId,))
-            result = cursor.fetchone()
-
-            if result and 'target_table' in result:
-                target_table = result['target_table']
-            else:
-                raise HTTPException(status_code=400, detail="Content ID not found")
-
-            # 허용된 테이블 이름인지 검증
-            allowed_tables = ['visit_main_fix', 'festival_main', 'stay_main',
-                              'culture_main', 'food_main', 'leports_main', 'shopping_main']  # 실제 테이블 이름으로 대체하세요.
-            if target_table not in allowed_tables:
-                raise HTTPException(status_code=400, detail="Invalid target table")
-
-            # 좋아요 수 업데이트
-            update_query = f"""
-            UPDATE {target_table}
-            SET like_count = like_count + 1
-            WHERE contentid = %s
-            """
-            cursor.execute(update_query, (like.contentId,))
+        # 사용자별 좋아요 집합 캐시에 반영 (write-through)
+        add_like(like.userId, like.contentId)
+
+        # 좋아요 수는 메모리에 모았다가 테이블별로 묶어서 반영 (인기 콘텐츠 행 잠금 경합 방지)
+        record_like_delta(like.contentId, 1)
+
+        # 메인 페이지 테마별 인기 목록에 반영
+        apply_like_delta(like.contentId, 1)
 
         return {"message": "Destination liked successfully"}
+    except HTTPException as he:
+        raise he
     except pymysql.MySQLError as err:
         print(f"Database Error: {err}")
         raise HTTPException(status_code=500, detail="Database Error")
@@ -96,54 +84,40 @@ async def like_destination(like: LikeRequest):
         connection.close()
 
 
+@router.post("/like")
+async def like_destination(like: LikeRequest):
+    return await run_db(_like_destination, like)
+
+
 # 좋아요 취소 엔드포인트
-@router.delete("/like")
-async def unlike_destination(like: LikeRequest):
+def _unlike_destination(like: LikeRequest):
     connection = get_db_connection()
     try:
+        validate_like_target(like.contentId, connection)
+
         with connection.cursor() as cursor:
-            # 좋아요 존재 여부 확인
-            check_query = """
-            SELECT COUNT(*) as count FROM likes
+            # 좋아요 삭제 (삭제된 행이 없으면 좋아요가 없던 것)
+            delete_query = """
+            DELETE FROM likes
             WHERE userId = %s AND contentId = %s
             """
-            cursor.execute(check_query, (like.userId, like.contentId))
-            result = cursor.fetchone()
+            deleted = cursor.execute(delete_query, (like.userId, like.contentId))
 
-            if result['count'] == 0:
+            if deleted == 0:
                 raise HTTPException(status_code=400, detail="Like not found")
 
-            # 좋아요 삭제
-            delete_query = """
-            DELETE FROM likes
-            WHERE userId = %s AND contentId = %s
-            """
-            cursor.execute(delete_query, (like.userId, like.contentId))
-
-            # 대상 테이블 이름 가져오기
-            cursor.execute("SELECT target_table FROM main_total_v2 WHERE contentsid = %s", (like.contentId,))
-            result = cursor.fetchone()
-
-            if result and 'target_table' in result:
-                target_table = result['target_table']
-            else:
-                raise HTTPException(status_code=400, detail="Content ID not found")
-
-            # 허용된 테이블 이름인지 검증
-            allowed_tables = ['visit_main_fix', 'festival_main', 'stay_main',
-                              'culture_main', 'food_main', 'leports_main', 'shopping_main']  # 실제 테이블 이름으로 대체하세요.
-            if target_table not in allowed_tables:
-                raise HTTPException(status_code=400, detail="Invalid target table")
-
-            # 좋아요 수 감소
-            update_query = f"""
-                        UPDATE {target_table}
-                        SET like_count = like_count - 1
-                        WHERE contentid = %s
-                        """
-            cursor.execute(update_query, (like.contentId,))
+        # 사용자별 좋아요 집합 캐시에 반영 (write-through)
+        remove_like(like.userId, like.contentId)
+
+        # 좋아요 수 감소 (메모리에 모았다가 묶어서 반영)
+        record_like_delta(like.contentId, -deleted)
+
+        # 메인 페이지 테마별 인기 목록에 반영
+        apply_like_delta(like.contentId, -deleted)
 
         return {"message": "Destination unliked successfully"}
+    except HTTPException as he:
+        raise he
     except pymysql.MySQLError as err:
         print(f"Database Error: {err}")
         raise HTTPException(status_code=500, detail="Database Error")
@@ -154,27 +128,58 @@ async def unlike_destination(like: LikeRequest):
         connection.close()
 
 
+@router.delete("/like")
+async def unlike_destination(like: LikeRequest):
+    return await run_db(_unlike_destination, like)
+
+
 # 좋아요 상태 확인 엔드포인트
+def _check_like_status(userId: int, contentId: int):
+    try:
+        # 사용자별 좋아요 집합 캐시 조회 (캐시에 없을 때만 DB에서 한 번 읽음)
+        liked = contentId in get_liked_content_ids(userId, [contentId])
+
+        return {"liked": liked}
+    except pymysql.MySQLError as err:
+        print(f"Database Error: {err}")
+        raise HTTPException(status_code=500, detail="Database Error")
+    except Exception as e:
+        print(f"Error: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
 @router.get("/like/status")
 async def check_like_status(userId: int, contentId: int):
-    connection = get_db_connection()
-    try:
-        with connection.cursor() as cursor:
-            check_query = """
-            SELECT COUNT(*) as count FROM likes
-            WHERE userId = %s AND contentId = %s
-            """
-            cursor.execute(check_query, (userId, contentId))
-            result = cursor.fetchone()
+    return await run_db(_check_like_status, userId, contentId)
 
-            liked = result['count'] > 0
 
-        return {"liked": liked}
+# 한 번에 확인할 수 있는 최대 contentId 수
+LIKE_STATUS_BULK_MAX = int(os.getenv('LIKE_STATUS_BULK_MAX', '500'))
+
+
+class LikeStatusBulkRequest(BaseModel):
+    userId: int
+    contentIds: List[int]
+
+
+# 여러 콘텐츠의 좋아요 상태를 한 번에 확인하는 엔드포인트
+def _check_like_status_bulk(request: LikeStatusBulkRequest):
+    try:
+        # 사용자별 좋아요 집합 캐시 조회
+        liked_ids = get_liked_content_ids(request.userId, request.contentIds)
+
+        # 요청 순서대로 contentId → 좋아요 여부
+        return {"liked": {content_id: content_id in liked_ids for content_id in request.contentIds}}
     except pymysql.MySQLError as err:
         print(f"Database Error: {err}")
         raise HTTPException(status_code=500, detail="Database Error")
     except Exception as e:
         print(f"Error: {e}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
-    finally:
-        connection.close()
\ No newline at end of file
+
+
+@router.post("/like/status/bulk")
+async def check_like_status_bulk(request: LikeStatusBulkRequest):
+    if len(request.contentIds) > LIKE_STATUS_BULK_MAX:
+        raise HTTPException(status_code=400, detail=f"Too many contentIds (max {LIKE_STATUS_BULK_MAX})")
+    return await run_db(_check_like_status_bulk, request)
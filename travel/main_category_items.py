@@ -1,10 +1,19 @@
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, APIRouter
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, APIRouter, Query
+from common.responses import JSONResponse, df_to_records
+import functools
 import os
+import random
 import pymysql
+from Database.pool import get_connection
+from Database.executor import run_db
+import numpy as np
 import pandas as pd
 import json
+from typing import Optional
+from common.cursor import decode_cursor, encode_cursor
+from common.lru import LRUCache
+from Database.snapshot import RefreshingSnapshot
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -12,33 +21,11 @@ load_dotenv()
 
 router = APIRouter()
 
-MYSQL_HOSTNAME = os.getenv('MYSQL_HOSTNAME')
-MYSQL_PORT = int(os.getenv('MYSQL_PORT'))
-MYSQL_USERNAME = os.getenv('MYSQL_USERNAME')
-MYSQL_PASSWORD = os.getenv('MYSQL_PASSWORD')
-MYSQL_DATABASE = os.getenv('MYSQL_DATABASE')
-
-
-def connect_mysql(query, params=None):
-    try:
-        connection = pymysql.connect(
-            host=MYSQL_HOSTNAME,
-            port=MYSQL_PORT,
-            user=MYSQL_USERNAME,
-            password=MYSQL_PASSWORD,
-            database=MYSQL_DATABASE
-        )
-        print(f"Executing query: {query} with params: {params}")
-        df = pd.read_sql(query, connection, params=params)
-        print(f"DataFrame head:\n{df.head()}")  # 데이터 확인용 로그
-        return df
-
-    except Exception as e:
-        print(f"Error: {str(e)}")
-        return pd.DataFrame()
-
-    finally:
-        connection.close()
+# 카테고리 목록 갱신 주기(초)와 시드별 정렬 순서 캐시 크기
+CATEGORY_TTL = int(os.getenv('CATEGORY_TTL', os.getenv('CATALOG_TTL', '600')))
+CATEGORY_ORDER_CACHE_SIZE = int(os.getenv('CATEGORY_ORDER_CACHE_SIZE', '256'))
+# 한 페이지 최대 크기
+CATEGORY_PAGE_MAX = 200
 
 
 category_mapping = {
@@ -63,34 +50,134 @@ category_table_mapping = {
 }
 
 
-@router.get("/categories/{category_name}")
-async def get_tourist_spots_by_category(category_name: str):
+class CategoryListing:
+    """
+    한 카테고리의 전체 목록 (firstimage가 있는 행만). 레코드는 여러 요청이 공유하므로 수정하지 않는다.
+    """
 
-    # 카테고리 이름이 올바른지 확인
-    if category_name not in category_table_mapping:
-        raise HTTPException(status_code=400, detail="Invalid category name")
+    def __init__(self, version, df):
+        self.version = version
+        self.records = df_to_records(df)
+        self.content_ids = df['contentid'].to_numpy(dtype=np.int64) if not df.empty else np.empty(0, dtype=np.int64)
 
-    # 해당 카테고리에 대한 테이블 이름 가져오기
-    table_name = category_table_mapping[category_name]
 
-    # 해당 카테고리에 대한 cat2 조건 가져오기
+def load_category_listing(category_name, version):
+    table_name = category_table_mapping[category_name]
     cat2_name = category_mapping[category_name]
 
-    # 해당 테이블의 모든 데이터 조회
     query = f"""SELECT cat2, cat3, contentid, firstimage, IFNULL(firstimage2, '') AS firstimage2, mapx, mapy, title, address, sigungucode
                 FROM {table_name} 
                 WHERE cat2 = %s
                 AND firstimage IS NOT NULL
-                AND firstimage not in ('', ' ', 'None')
-                ORDER BY RAND();"""
+                AND firstimage not in ('', ' ', 'None')"""
+
+    with get_connection() as connection:
+        df = pd.read_sql(query, connection, params=(cat2_name,))
+    return CategoryListing(version, df)
+
+
+_category_snapshots = {
+    category_name: RefreshingSnapshot(f'category_{category_name}',
+                                      functools.partial(load_category_listing, category_name), CATEGORY_TTL)
+    for category_name in category_table_mapping
+}
+
+# (카테고리, 목록 버전, seed) → (정렬된 행 위치, 정렬된 셔플 키)
+_order_cache = LRUCache(CATEGORY_ORDER_CACHE_SIZE)
+
+_MASK64 = (1 << 64) - 1
 
-    df = connect_mysql(query, params=(cat2_name,))
-    if df.empty:
+
+def shuffle_keys(content_ids, seed):
+    """
+    contentid와 seed를 섞은 64비트 해시 (splitmix64). 이 키로 정렬하면 seed마다 고정된 무작위 순서가 되고,
+    목록에 행이 추가/삭제되어도 나머지 행들의 상대 순서는 바뀌지 않는다.
+    """
+    with np.errstate(over='ignore'):
+        z = content_ids.astype(np.uint64) ^ np.uint64(seed & _MASK64)
+        z = z + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
+def get_shuffled_order(category_name, listing, seed):
+    cache_key = (category_name, listing.version, seed)
+    order = _order_cache.get(cache_key)
+    if order is None:
+        keys = shuffle_keys(listing.content_ids, seed)
+        # 키가 같은 경우(사실상 없음)는 contentid 순으로
+        positions = np.lexsort((listing.content_ids, keys))
+        order = (positions, keys[positions], listing.content_ids[positions])
+        _order_cache.put(cache_key, order)
+    return order
+
+
+def _get_tourist_spots_by_category(category_name: str, limit: Optional[int] = None,
+                                   cursor: Optional[str] = None, seed: Optional[int] = None):
+
+    # 카테고리 이름이 올바른지 확인
+    if category_name not in category_table_mapping:
+        raise HTTPException(status_code=400, detail="Invalid category name")
+
+    # 해당 카테고리의 전체 목록 (메모리 스냅샷, 읽지 못하면 기존처럼 빈 목록)
+    try:
+        listing = _category_snapshots[category_name].get()
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return JSONResponse(content={"result": []})
+    if not listing.records:
         return JSONResponse(content={"result": []})
 
-    # 데이터프레임을 JSON 형태로 변환
+    # limit이 없으면 기존처럼 전체 목록을 반환 (seed를 주면 그 seed의 고정 순서, 아니면 매번 새로운 무작위 순서)
+    if limit is None and cursor is None:
+        if seed is not None:
+            order = get_shuffled_order(category_name, listing, seed & _MASK64)[0]
+        else:
+            order = np.random.permutation(len(listing.records))
+        return JSONResponse(content={"result": [listing.records[position] for position in order]})
+
+    limit = min(limit or CATEGORY_PAGE_MAX, CATEGORY_PAGE_MAX)
+
+    # 첫 페이지는 seed를 새로 정하고, 이후 페이지는 커서에 담긴 seed와 마지막 위치에서 이어서 조회
+    if cursor is not None:
+        seed, last_key, last_content_id = decode_cursor(cursor, "s", "k", "c")
+        try:
+            seed, last_key, last_content_id = int(seed), int(last_key), int(last_content_id)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        # 변조된 커서가 uint64 범위를 벗어나면 searchsorted에서 OverflowError가 나므로 미리 거름
+        if not all(0 <= value <= _MASK64 for value in (seed, last_key, last_content_id)):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    elif seed is None:
+        seed = random.getrandbits(63)
+    seed &= _MASK64
+
+    positions, keys, content_ids = get_shuffled_order(category_name, listing, seed)
+    start = 0
+    if cursor is not None:
+        # (키, contentid)가 커서보다 큰 첫 위치 (그 사이 행이 추가/삭제되어도 중복·누락 없이 이어짐)
+        start = int(np.searchsorted(keys, np.uint64(last_key), side='left'))
+        while start < len(keys) and keys[start] == last_key and content_ids[start] <= last_content_id:
+            start += 1
+
+    page = positions[start:start + limit]
+    end = start + len(page)
+    next_cursor = None
+    if end < len(keys) and len(page):
+        next_cursor = encode_cursor({"s": seed, "k": int(keys[end - 1]), "c": int(content_ids[end - 1])})
+
     json_output = {
-        "result": df.to_dict(orient='records')
+        "result": [listing.records[position] for position in page],
+        "next_cursor": next_cursor
     }
 
-    return JSONResponse(content=json_output)
\ No newline at end of file
+    return JSONResponse(content=json_output)
+
+
+@router.get("/categories/{category_name}")
+async def get_tourist_spots_by_category(category_name: str,
+                                        limit: Optional[int] = Query(None, ge=1, description="페이지 크기 (없으면 전체 목록)"),
+                                        cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+                                        seed: Optional[int] = Query(None, ge=0, description="셔플 seed (세션마다 고정하고 싶을 때)")):
+    return await run_db(_get_tourist_spots_by_category, category_name, limit, cursor, seed)
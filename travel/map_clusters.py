@@ -0,0 +1,134 @@
+from dotenv import load_dotenv
+from fastapi import HTTPException, APIRouter, Query
+from common.responses import JSONResponse, df_to_records
+from Database.executor import run_db
+from travel.catalog import get_catalog
+from travel.main_category_items import category_mapping, category_table_mapping
+import numpy as np
+import pandas as pd
+import os
+from typing import Optional
+import warnings
+warnings.filterwarnings('ignore')
+
+load_dotenv()
+
+router = APIRouter()
+
+# 256px 타일 하나를 몇 칸으로 나눠 묶을지 (4 → 약 64px 격자)
+MAP_CELLS_PER_TILE = int(os.getenv('MAP_CELLS_PER_TILE', '4'))
+# 이 줌 이상에서는 묶지 않고 개별 마커로 반환
+MAP_CLUSTER_MAX_ZOOM = int(os.getenv('MAP_CLUSTER_MAX_ZOOM', '17'))
+# 개별 마커로 내려갈 때 포함하는 필드
+MARKER_COLUMNS = ['contentid', 'title', 'cat2', 'cat3', 'firstimage', 'mapx', 'mapy']
+
+
+class MapIndex:
+    """
+    모든 허용 테이블 카드의 좌표를 mapx 순으로 정렬해 둔 공간 인덱스.
+    bbox 조회는 mapx 범위를 searchsorted로 자른 뒤 mapy만 걸러낸다.
+    """
+
+    def __init__(self, cards):
+        frames = []
+        for table, df in cards.items():
+            df = df.assign(target_table=table,
+                           mapx=pd.to_numeric(df['mapx'], errors='coerce'),
+                           mapy=pd.to_numeric(df['mapy'], errors='coerce'))
+            # 좌표가 없거나 0인 행은 지도에 올릴 수 없으므로 제외
+            frames.append(df[df['mapx'].notnull() & df['mapy'].notnull() & (df['mapx'] != 0) & (df['mapy'] != 0)])
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=MARKER_COLUMNS + ['target_table'])
+        df = df.sort_values('mapx', kind='stable').reset_index(drop=True)
+
+        self.df = df
+        self.x = df['mapx'].to_numpy(dtype=np.float64)
+        self.y = df['mapy'].to_numpy(dtype=np.float64)
+        self.tables = df['target_table'].to_numpy(dtype=object)
+        self.cat2 = df['cat2'].to_numpy(dtype=object)
+        self.titles = df['title'].fillna('').astype(str).to_numpy(dtype=object)
+
+    def query(self, min_x, min_y, max_x, max_y, table=None, cat2=None, keyword=None):
+        # bbox 안에 있는 행 위치 (필터 적용)
+        start = int(np.searchsorted(self.x, min_x, side='left'))
+        end = int(np.searchsorted(self.x, max_x, side='right'))
+        positions = np.arange(start, end)
+        mask = (self.y[start:end] >= min_y) & (self.y[start:end] <= max_y)
+        if table is not None:
+            mask &= self.tables[start:end] == table
+        if cat2 is not None:
+            mask &= self.cat2[start:end] == cat2
+        if keyword:
+            mask &= np.fromiter((keyword in title for title in self.titles[start:end]), dtype=bool, count=end - start)
+        return positions[mask]
+
+
+def build_map_index(catalog):
+    return MapIndex(catalog.cards)
+
+
+def cluster_positions(x, y, zoom):
+    """
+    줌 레벨에 맞는 격자(타일 크기 / MAP_CELLS_PER_TILE)로 좌표를 묶어
+    (격자 크기, 행별 칸 번호, 칸별 개수, 칸별 중심 x, 칸별 중심 y)를 반환
+    """
+    cell_size = 360.0 / (2 ** zoom) / MAP_CELLS_PER_TILE
+    cells = np.stack([np.floor(x / cell_size), np.floor(y / cell_size)], axis=1).astype(np.int64)
+    unique_cells, inverse, counts = np.unique(cells, axis=0, return_inverse=True, return_counts=True)
+    inverse = inverse.reshape(-1)
+    center_x = np.bincount(inverse, weights=x) / counts
+    center_y = np.bincount(inverse, weights=y) / counts
+    return cell_size, inverse, counts, center_x, center_y
+
+
+def _get_map_clusters(min_x: float, min_y: float, max_x: float, max_y: float, zoom: int,
+                      category: Optional[str], keyword: Optional[str]):
+    if min_x >= max_x or min_y >= max_y:
+        raise HTTPException(status_code=400, detail="Invalid bounding box")
+
+    # 카테고리 화면과 같은 이름으로 필터 (테이블 + cat2)
+    table = cat2 = None
+    if category is not None:
+        if category not in category_table_mapping:
+            raise HTTPException(status_code=400, detail="Invalid category name")
+        table = category_table_mapping[category]
+        cat2 = category_mapping[category]
+
+    map_index = get_catalog().derived('map_index', build_map_index)
+    positions = map_index.query(min_x, min_y, max_x, max_y, table, cat2, keyword)
+
+    json_output = {"zoom": zoom, "total": int(len(positions)), "clusters": [], "markers": []}
+    if len(positions) == 0:
+        return JSONResponse(content=json_output)
+
+    if zoom >= MAP_CLUSTER_MAX_ZOOM:
+        json_output["markers"] = df_to_records(map_index.df.loc[positions, MARKER_COLUMNS])
+        return JSONResponse(content=json_output)
+
+    cell_size, inverse, counts, center_x, center_y = cluster_positions(
+        map_index.x[positions], map_index.y[positions], zoom)
+    json_output["cell_size"] = cell_size
+
+    # 한 칸에 하나뿐인 항목은 개별 마커로, 나머지는 개수와 중심 좌표만
+    single = counts[inverse] == 1
+    if single.any():
+        json_output["markers"] = df_to_records(map_index.df.loc[positions[single], MARKER_COLUMNS])
+    multi = np.flatnonzero(counts > 1)
+    json_output["clusters"] = [
+        {"mapx": mapx, "mapy": mapy, "count": count}
+        for mapx, mapy, count in zip(center_x[multi].tolist(), center_y[multi].tolist(), counts[multi].tolist())
+    ]
+    return JSONResponse(content=json_output)
+
+
+@router.get("/map/clusters")
+async def get_map_clusters(min_x: float = Query(..., description="bbox 서쪽 경도 (mapx)"),
+                           min_y: float = Query(..., description="bbox 남쪽 위도 (mapy)"),
+                           max_x: float = Query(..., description="bbox 동쪽 경도 (mapx)"),
+                           max_y: float = Query(..., description="bbox 북쪽 위도 (mapy)"),
+                           zoom: int = Query(..., ge=0, le=22, description="지도 줌 레벨"),
+                           category: Optional[str] = Query(None, description="카테고리 이름 (categories API와 동일)"),
+                           keyword: Optional[str] = Query(None, description="제목 검색어")):
+    """
+    bbox 안의 관광 아이템을 줌 레벨에 맞는 격자로 묶어 클러스터(개수, 중심 좌표)와 개별 마커로 반환
+    """
+    return await run_db(_get_map_clusters, min_x, min_y, max_x, max_y, zoom, category, keyword)
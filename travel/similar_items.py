@@ -0,0 +1,72 @@
+import random
+
+from common.responses import df_to_records
+
+# 상세 페이지 "비슷한 여행지"에 내려가는 필드와 개수
+SIMILAR_ITEM_COLUMNS = ['contentid', 'title', 'cat3', 'address', 'firstimage']
+SIMILAR_ITEM_COUNT = 5
+
+
+class CategorySampler:
+    """
+    (테이블, cat3) 별 콘텐츠 목록. ORDER BY RAND() 대신 메모리에서 k개를 뽑는다.
+
+    - 그룹마다 레코드 목록과 contentid → 그룹 내 위치를 들고 있어 현재 콘텐츠 제외가 O(1)
+    - 샘플링은 Floyd 알고리즘으로 그룹 크기와 무관하게 O(k)
+    - seed를 주면 같은 결과가 나오므로 응답 캐싱에 쓸 수 있다
+    """
+
+    def __init__(self, cards):
+        self.groups = {}
+        self.positions = {}
+        for table, df in cards.items():
+            df = df[df['cat3'].notnull()]
+            records = df_to_records(df[SIMILAR_ITEM_COLUMNS])
+            for record in records:
+                key = (table, record['cat3'])
+                group = self.groups.setdefault(key, [])
+                self.positions[(table, record['contentid'])] = (key, len(group))
+                group.append(record)
+
+    def category_of(self, table, contentid):
+        # 카드에 있는 콘텐츠의 cat3 (없으면 None)
+        located = self.positions.get((table, contentid))
+        return located[0][1] if located is not None else None
+
+    def sample(self, table, category, exclude_id=None, k=SIMILAR_ITEM_COUNT, seed=None):
+        # 반환 레코드는 스냅샷이 공유하므로 수정하지 말고 사본을 만들어 쓸 것
+        group = self.groups.get((table, category))
+        if not group:
+            return []
+
+        # 제외할 콘텐츠가 이 그룹에 있으면 그 위치를 건너뛰도록 인덱스를 한 칸씩 민다
+        excluded = None
+        located = self.positions.get((table, exclude_id))
+        if located is not None and located[0] == (table, category):
+            excluded = located[1]
+        n = len(group) - (1 if excluded is not None else 0)
+        k = min(k, n)
+        if k <= 0:
+            return []
+
+        rng = random.Random(seed)
+        chosen = []
+        chosen_set = set()
+        for upper in range(n - k, n):
+            index = rng.randint(0, upper)
+            if index in chosen_set:
+                index = upper
+            chosen_set.add(index)
+            chosen.append(index)
+        # Floyd 알고리즘은 뒤쪽 인덱스가 끝에 몰리므로 순서를 한 번 섞는다
+        rng.shuffle(chosen)
+
+        return [group[index + 1 if excluded is not None and index >= excluded else index] for index in chosen]
+
+
+def build_category_sampler(catalog):
+    return CategorySampler(catalog.cards)
+
+
+def get_category_sampler(catalog):
+    return catalog.derived('category_sampler', build_category_sampler)
@@ -0,0 +1,96 @@
+import ast
+import json
+
+import numpy as np
+
+
+# 문자열을 리스트로 변환하는 함수
+def convert_string_to_list(tag_string):
+    # ast.literal_eval로 문자열을 리스트로 변환
+    if not tag_string:
+        return []
+    if isinstance(tag_string, list):
+        return tag_string
+    if isinstance(tag_string, str):
+        tag_string = tag_string.strip()
+        # Try to parse with json.loads
+        try:
+            return json.loads(tag_string)
+        except json.JSONDecodeError:
+            pass
+        # Try to parse with ast.literal_eval
+        try:
+            return ast.literal_eval(tag_string)
+        except (ValueError, SyntaxError):
+            pass
+        # If all else fails, assume it's a comma-separated string
+        return [tag.strip() for tag in tag_string.split(',')]
+    return []
+
+
+# tag 컬럼은 "['힐링', '바다']" 형태의 문자열이 한 번 더 JSON 문자열로 감싸져 저장되어 있음
+def parse_tags(tag_value):
+    tags = convert_string_to_list(tag_value)
+    if isinstance(tags, str):
+        tags = convert_string_to_list(tags)
+    if not isinstance(tags, (list, tuple, set)):
+        return []
+    return [tag for tag in tags if isinstance(tag, str)]
+
+
+class TagIndex:
+    """
+    태그 → 행 위치 역색인. 카탈로그 스냅샷마다 한 번만 태그 문자열을 파싱하고,
+    요청 시에는 사용자 태그의 posting 목록만 더해 일치 개수를 구한다.
+    """
+
+    def __init__(self, df):
+        df = df[df['tag'].notnull()].reset_index(drop=True)
+        self.df = df
+        self.size = len(df)
+
+        self.tag_ids = {}
+        postings = []
+        for position, tag_value in enumerate(df['tag']):
+            for tag in set(parse_tags(tag_value)):
+                tag_id = self.tag_ids.get(tag)
+                if tag_id is None:
+                    tag_id = len(postings)
+                    self.tag_ids[tag] = tag_id
+                    postings.append([])
+                postings[tag_id].append(position)
+        self.postings = [np.asarray(rows, dtype=np.int64) for rows in postings]
+
+        # 리뷰 수 내림차순 순위 (동점은 원래 행 순서 유지)
+        review_count = df['review_count'].fillna(0).to_numpy() if 'review_count' in df else np.zeros(self.size)
+        order = np.argsort(-review_count, kind='stable')
+        self.review_rank = np.empty(self.size, dtype=np.int64)
+        self.review_rank[order] = np.arange(self.size)
+
+    def match_counts(self, user_tags):
+        counts = np.zeros(self.size, dtype=np.int64)
+        for tag in set(user_tags):
+            tag_id = self.tag_ids.get(tag)
+            if tag_id is not None:
+                counts[self.postings[tag_id]] += 1
+        return counts
+
+    def top_k(self, user_tags, k):
+        """
+        일치 태그 수 내림차순 → 리뷰 수 내림차순으로 상위 k개 행 위치를 반환 (일치 0개인 행 제외)
+        """
+        counts = self.match_counts(user_tags)
+        candidates = np.flatnonzero(counts)
+        if len(candidates) == 0 or k <= 0:
+            return candidates[:0]
+
+        # 두 정렬 기준을 하나의 정수 키로 합침: 일치 수가 우선, 같으면 리뷰 순위가 높은 행이 큼
+        keys = counts[candidates] * self.size + (self.size - 1 - self.review_rank[candidates])
+        if len(candidates) > k:
+            selected = np.argpartition(-keys, k - 1)[:k]
+            candidates, keys = candidates[selected], keys[selected]
+        return candidates[np.argsort(-keys)]
+
+
+def build_tag_index(catalog):
+    return TagIndex(catalog.df_fix)
@@ -0,0 +1,186 @@
+import os
+import threading
+
+import numpy as np
+from dotenv import load_dotenv
+
+from Database.pool import get_connection
+from Database.snapshot import RefreshingSnapshot
+
+load_dotenv()
+
+# contentid → target_table 매핑 갱신 주기(초)
+TARGET_TABLE_TTL = int(os.getenv('TARGET_TABLE_TTL', '600'))
+
+# 좋아요/일정 수 갱신, 상세 조회가 허용된 실제 콘텐츠 테이블
+ALLOWED_TABLES = ('visit_main_fix', 'festival_main', 'stay_main',
+                  'culture_main', 'food_main', 'leports_main', 'shopping_main')
+
+
+class TargetTableMap:
+    """
+    main_total_v2 전체를 정렬된 contentid 배열 + 테이블 코드(int8) 배열로 들고 있는 읽기 전용 매핑.
+    테이블 이름은 코드 → 이름 목록으로 한 번만 저장한다.
+    """
+
+    def __init__(self, version, rows):
+        self.version = version
+        self.table_names = []
+        table_codes = {}
+        content_ids = []
+        codes = []
+        for content_id, table in rows:
+            content_id = _to_content_id(content_id)
+            if content_id is None or not table:
+                continue
+            code = table_codes.get(table)
+            if code is None:
+                code = len(self.table_names)
+                table_codes[table] = code
+                self.table_names.append(table)
+            content_ids.append(content_id)
+            codes.append(code)
+
+        content_ids = np.asarray(content_ids, dtype=np.int64)
+        codes = np.asarray(codes, dtype=np.int8)
+        order = np.argsort(content_ids, kind='stable')
+        self.content_ids = content_ids[order]
+        self.codes = codes[order]
+
+    def __len__(self):
+        return len(self.content_ids)
+
+    def lookup_many(self, content_ids):
+        # 찾은 contentid만 {contentid: target_table}로 반환
+        if not content_ids or len(self.content_ids) == 0:
+            return {}
+        keys = np.asarray(content_ids, dtype=np.int64)
+        positions = np.searchsorted(self.content_ids, keys)
+        positions = np.minimum(positions, len(self.content_ids) - 1)
+        found = self.content_ids[positions] == keys
+        return {
+            int(content_id): self.table_names[code]
+            for content_id, code in zip(keys[found].tolist(), self.codes[positions[found]].tolist())
+        }
+
+
+def _to_content_id(content_id):
+    try:
+        return int(content_id)
+    except (TypeError, ValueError):
+        return None
+
+
+def _fetch_target_tables(connection, content_ids=None):
+    query = "SELECT contentsid, target_table FROM main_total_v2"
+    params = None
+    if content_ids is not None:
+        query += " WHERE contentsid IN %s"
+        params = (tuple(content_ids),)
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+    return [
+        (row['contentsid'], row['target_table']) if isinstance(row, dict) else (row[0], row[1])
+        for row in rows
+    ]
+
+
+def load_target_tables(version):
+    with get_connection() as connection:
+        rows = _fetch_target_tables(connection)
+    return TargetTableMap(version, rows)
+
+
+def _fetch_found(connection, content_ids):
+    # DB에서 직접 찾은 {contentid: target_table}
+    found = {}
+    for content_id, table in _fetch_target_tables(connection, content_ids):
+        content_id = _to_content_id(content_id)
+        if content_id is not None and table:
+            found[content_id] = table
+    return found
+
+
+_target_table_snapshot = RefreshingSnapshot('target_table', load_target_tables, TARGET_TABLE_TTL)
+
+# 스냅샷 이후 새로 추가되어 DB에서 직접 찾은 항목 (스냅샷이 교체되면 비움)
+_recent = {}
+_recent_version = 0
+_recent_lock = threading.Lock()
+
+
+def resolve_target_tables(content_ids, connection=None):
+    """
+    여러 contentid의 target_table을 한 번에 조회해 {contentid: target_table}로 반환.
+    메모리 매핑에 없는 것만 한 번의 IN 쿼리로 DB에서 찾으며, 끝까지 없는 contentid는 결과에서 빠진다.
+    connection을 넘기면 그 연결로 조회한다 (이미 연결을 대여한 핸들러가 풀을 한 번 더 기다리지 않도록).
+    """
+    global _recent, _recent_version
+    content_ids = {content_id for content_id in map(_to_content_id, content_ids) if content_id is not None}
+    if not content_ids:
+        return {}
+
+    # 연결을 넘긴 경우 첫 로드를 기다리지 않고 그 연결로 직접 조회 (로더가 풀의 연결을 하나 더 기다리지 않도록)
+    mapping = _target_table_snapshot.get_nowait() if connection is not None else _target_table_snapshot.get()
+    if mapping is None:
+        return _fetch_found(connection, content_ids)
+
+    result = mapping.lookup_many(list(content_ids))
+    missing = content_ids.difference(result)
+    if not missing:
+        return result
+
+    with _recent_lock:
+        if _recent_version != mapping.version:
+            _recent = {}
+            _recent_version = mapping.version
+        for content_id in list(missing):
+            table = _recent.get(content_id)
+            if table is not None:
+                result[content_id] = table
+                missing.discard(content_id)
+    if not missing:
+        return result
+
+    if connection is None:
+        with get_connection() as connection:
+            found = _fetch_found(connection, missing)
+    else:
+        found = _fetch_found(connection, missing)
+    if found:
+        result.update(found)
+        with _recent_lock:
+            if _recent_version == mapping.version:
+                _recent.update(found)
+        # 새 콘텐츠가 생겼으므로 다음 조회부터 백그라운드에서 매핑을 다시 읽음
+        _target_table_snapshot.invalidate()
+    return result
+
+
+def resolve_target_table(content_id, connection=None):
+    # 단건 조회 (없으면 None)
+    content_id = _to_content_id(content_id)
+    if content_id is None:
+        return None
+    return resolve_target_tables([content_id], connection).get(content_id)
+
+
+def group_by_table(content_ids, connection=None):
+    # 허용된 테이블별로 contentid를 묶어 반환 (입력 순서 유지, 허용되지 않은 테이블/없는 contentid는 제외)
+    tables = resolve_target_tables(content_ids, connection)
+    groups = {}
+    seen = set()
+    for content_id in map(_to_content_id, content_ids):
+        if content_id is None or content_id in seen:
+            continue
+        seen.add(content_id)
+        table = tables.get(content_id)
+        if table in ALLOWED_TABLES:
+            groups.setdefault(table, []).append(content_id)
+    return groups
+
+
+def warm_target_tables():
+    # 서비스 시작 전에 매핑을 미리 로드 (첫 요청이 연결을 잡은 채 로드를 기다리지 않도록)
+    return _target_table_snapshot.get()
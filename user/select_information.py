@@ -3,6 +3,8 @@ from fastapi import FastAPI, HTTPException, status, APIRouter
 from pydantic import BaseModel
 import os
 import pymysql
+from Database.pool import get_connection
+from Database.executor import run_db
 from typing import List, Optional
 import json
 import warnings
@@ -12,23 +14,10 @@ load_dotenv()
 
 router = APIRouter()
 
-# MySQL 연결 정보 (기존과 동일)
-MYSQL_HOSTNAME = os.getenv('MYSQL_HOSTNAME')
-MYSQL_PORT = int(os.getenv('MYSQL_PORT'))
-MYSQL_USERNAME = os.getenv('MYSQL_USERNAME')
-MYSQL_PASSWORD = os.getenv('MYSQL_PASSWORD')
-MYSQL_DATABASE = os.getenv('MYSQL_DATABASE')
-
 def get_onboarding_info(user_id: int) -> Optional[dict]:
     connection = None
     try:
-        connection = pymysql.connect(
-            host=MYSQL_HOSTNAME,
-            port=MYSQL_PORT,
-            user=MYSQL_USERNAME,
-            password=MYSQL_PASSWORD,
-            database=MYSQL_DATABASE
-        )
+        connection = get_connection()
 
         with connection.cursor() as cursor:
             query = "SELECT ageRange, gender, travelType FROM onboarding_info WHERE userId = %s"
@@ -87,7 +76,7 @@ async def retrieve_onboarding_info(user_id: int):
     요청된 userId에 해당하는 온보딩 정보를 조회하여 반환합니다.
     """
     try:
-        onboarding_info = get_onboarding_info(user_id)
+        onboarding_info = await run_db(get_onboarding_info, user_id)
         if onboarding_info:
             return onboarding_info
         else:
@@ -1,9 +1,14 @@
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, APIRouter
+from fastapi import FastAPI, HTTPException, APIRouter, Query
 from pydantic import BaseModel
 import os
 import pymysql
-from typing import List, Dict, Any
+from Database.pool import get_connection
+from Database.executor import run_db
+from travel.target_table import group_by_table
+from common.cursor import decode_cursor, encode_cursor
+from typing import List, Dict, Any, Optional
+from datetime import datetime
 import json
 import warnings
 warnings.filterwarnings('ignore')
@@ -12,90 +17,103 @@ load_dotenv()
 
 router = APIRouter()
 
-# MySQL 연결 정보 (기존과 동일)
-MYSQL_HOSTNAME = os.getenv('MYSQL_HOSTNAME')
-MYSQL_PORT = int(os.getenv('MYSQL_PORT'))
-MYSQL_USERNAME = os.getenv('MYSQL_USERNAME')
-MYSQL_PASSWORD = os.getenv('MYSQL_PASSWORD')
-MYSQL_DATABASE = os.getenv('MYSQL_DATABASE')
-
-
 # 데이터베이스 연결 함수 (기존과 동일)
 def get_db_connection():
-    connection = pymysql.connect(
-        host=MYSQL_HOSTNAME,
-        port=MYSQL_PORT,
-        user=MYSQL_USERNAME,
-        password=MYSQL_PASSWORD,
-        database=MYSQL_DATABASE,
+    connection = get_connection(
         cursorclass=pymysql.cursors.DictCursor,
         autocommit=True
     )
     return connection
 
 
+# 한 페이지 최대 크기
+LIKE_LIST_PAGE_MAX = 100
+
+
+# 좋아요 목록 조회 (limit이 있으면 likedAt 커서 기준 한 페이지만)
+def fetch_likes_page(cursor, user_id, limit=None, after=None):
+    likes_query = """
+    SELECT contentId, likedAt
+    FROM likes
+    WHERE userId = %s
+    """
+    params = [user_id]
+    if after is not None:
+        # 이전 페이지 마지막 항목보다 뒤의 항목 (likedAt이 같으면 contentId로 구분)
+        likes_query += " AND (likedAt < %s OR (likedAt = %s AND contentId < %s))"
+        params += [after[0], after[0], after[1]]
+    likes_query += " ORDER BY likedAt DESC, contentId DESC"
+    if limit is not None:
+        # 다음 페이지 유무 확인을 위해 하나 더 조회
+        likes_query += " LIMIT %s"
+        params.append(limit + 1)
+    cursor.execute(likes_query, params)
+    return cursor.fetchall()
+
+
+# 테이블별로 묶어 테이블당 한 번의 IN 쿼리로 콘텐츠 정보 조회
+def fetch_contents(cursor, connection, content_ids):
+    contents = {}
+    for target_table, ids in group_by_table(content_ids, connection).items():
+        content_query = f"""
+        SELECT contentid, firstimage, title, address, cat2, cat3
+        FROM {target_table}
+        WHERE contentid IN %s
+        """
+        cursor.execute(content_query, (tuple(ids),))
+        for content_info in cursor.fetchall():
+            contents.setdefault(content_info['contentid'], content_info)
+    return contents
+
+
 # 좋아요한 콘텐츠 상세 정보 조회 엔드포인트
-@router.get("/user_likes/{user_id}")
-async def get_user_liked_contents(user_id: int):
+def _get_user_liked_contents(user_id: int, limit: Optional[int] = None, cursor_token: Optional[str] = None):
+    after = None
+    if cursor_token is not None:
+        liked_at, content_id = decode_cursor(cursor_token, "t", "c")
+        try:
+            after = (datetime.fromisoformat(liked_at), int(content_id))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        limit = limit or LIKE_LIST_PAGE_MAX
+    if limit is not None:
+        limit = min(limit, LIKE_LIST_PAGE_MAX)
+
     connection = get_db_connection()
     try:
         with connection.cursor() as cursor:
             # 1. 해당 사용자가 좋아요한 contentId 가져오기
-            likes_query = """
-            SELECT contentId, likedAt
-            FROM likes
-            WHERE userId = %s
-            ORDER BY likedAt DESC
-            """
-            cursor.execute(likes_query, (user_id,))
-            liked_contents = cursor.fetchall()
+            liked_contents = fetch_likes_page(cursor, user_id, limit, after)
+
+            next_cursor = None
+            if limit is not None and len(liked_contents) > limit:
+                liked_contents = liked_contents[:limit]
+                last = liked_contents[-1]
+                next_cursor = encode_cursor({"t": last['likedAt'].isoformat(), "c": last['contentId']})
 
             if not liked_contents:
-                return {"message": "No liked contents found for this user", "data": []}
+                response = {"message": "No liked contents found for this user", "data": []}
+                if limit is not None:
+                    response["next_cursor"] = None
+                return response
 
-            result_data = []
+            # 2. 콘텐츠 정보를 테이블별로 한 번에 조회 (허용되지 않은/없는 콘텐츠는 제외됨)
+            contents = fetch_contents(cursor, connection, [content['contentId'] for content in liked_contents])
 
-            # 2. 각 contentId에 대해 처리
+            # 3. 좋아요 순서대로 likedAt을 붙여 결과 구성
+            result_data = []
             for content in liked_contents:
-                content_id = content['contentId']
-                liked_at = content['likedAt']
-
-                # 2. main_total_v2에서 target_table 조회
-                target_table_query = """
-                SELECT target_table
-                FROM main_total_v2
-                WHERE contentsid = %s
-                """
-                cursor.execute(target_table_query, (content_id,))
-                target_table_result = cursor.fetchone()
-
-                if target_table_result and 'target_table' in target_table_result:
-                    target_table = target_table_result['target_table']
-                else:
-                    continue  # 해당 contentId에 대한 target_table이 없으면 다음으로 넘어감
-
-                # 3. 허용된 테이블인지 검증
-                allowed_tables = ['visit_main_fix', 'festival_main', 'stay_main',
-                                  'culture_main', 'food_main', 'leports_main', 'shopping_main']
-                if target_table not in allowed_tables:
-                    continue  # 허용되지 않은 테이블이면 건너뜀
-
-                # 4. 해당 target_table에서 데이터 조회
-                content_query = f"""
-                SELECT contentid, firstimage, title, address, cat2, cat3
-                FROM {target_table}
-                WHERE contentid = %s
-                """
-                cursor.execute(content_query, (content_id,))
-                content_info = cursor.fetchone()
-
+                content_info = contents.get(content['contentId'])
                 if content_info:
-                    # likedAt 추가
-                    content_info['likedAt'] = liked_at
-                    result_data.append(content_info)
+                    result_data.append(dict(content_info, likedAt=content['likedAt']))
 
-            return {"message": "Success", "data": result_data}
+            response = {"message": "Success", "data": result_data}
+            if limit is not None:
+                response["next_cursor"] = next_cursor
+            return response
 
+    except HTTPException as he:
+        raise he
     except pymysql.MySQLError as err:
         print(f"Database Error: {err}")
         raise HTTPException(status_code=500, detail="Database Error")
@@ -103,4 +121,11 @@ async def get_user_liked_contents(user_id: int):
         print(f"Error: {e}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
     finally:
-        connection.close()
\ No newline at end of file
+        connection.close()
+
+
+@router.get("/user_likes/{user_id}")
+async def get_user_liked_contents(user_id: int,
+                                  limit: Optional[int] = Query(None, ge=1, description="페이지 크기 (없으면 전체 목록)"),
+                                  cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor")):
+    return await run_db(_get_user_liked_contents, user_id, limit, cursor)
@@ -3,6 +3,8 @@ from fastapi import FastAPI, HTTPException, status, APIRouter
 from pydantic import BaseModel
 import os
 import pymysql
+from Database.pool import get_connection
+from Database.executor import run_db
 from typing import List
 import json
 import warnings
@@ -12,13 +14,6 @@ load_dotenv()
 
 router = APIRouter()
 
-# MySQL 연결 정보 (기존과 동일)
-MYSQL_HOSTNAME = os.getenv('MYSQL_HOSTNAME')
-MYSQL_PORT = int(os.getenv('MYSQL_PORT'))
-MYSQL_USERNAME = os.getenv('MYSQL_USERNAME')
-MYSQL_PASSWORD = os.getenv('MYSQL_PASSWORD')
-MYSQL_DATABASE = os.getenv('MYSQL_DATABASE')
-
 def update_onboarding_info(user_id: int, age_range: int, gender: int, travel_type: List[str]):
     # 여행 타입 매핑 딕셔너리 정의 (기존과 동일)
     travel_type_mapping = {
@@ -41,13 +36,7 @@ def update_onboarding_info(user_id: int, age_range: int, gender: int, travel_typ
 
     connection = None
     try:
-        connection = pymysql.connect(
-            host=MYSQL_HOSTNAME,
-            port=MYSQL_PORT,
-            user=MYSQL_USERNAME,
-            password=MYSQL_PASSWORD,
-            database=MYSQL_DATABASE
-        )
+        connection = get_connection()
 
         with connection.cursor() as cursor:
             # 먼저 해당 userId가 존재하는지 확인
@@ -90,7 +79,8 @@ async def update_onboarding(info: OnboardingUpdateInfo):
     온보딩 정보를 업데이트합니다.
     """
     try:
-        response = update_onboarding_info(
+        response = await run_db(
+            update_onboarding_info,
             user_id=info.userId,
             age_range=info.ageRange,
             gender=info.gender,